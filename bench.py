@@ -0,0 +1,653 @@
+"""Search benchmarks for the DESTROYER AI engine.
+
+Usage:
+    python bench.py smp --depth 3 --workers 1 2 4 8
+    python bench.py distributed --depth 3 --local-workers 4
+    python bench.py distributed --depth 3 --hosts box1:7777 box2:7777
+    python bench.py nullmove --depth 3
+    python bench.py pruning --depth 3 --techniques futility razoring
+    python bench.py verify --depth 2
+    python bench.py ordering --depth 3
+    python bench.py evalcheck --games 200
+    python bench.py mobility --games 100
+    python bench.py lazy --depth 3 --games 200
+    python bench.py batch --games 200
+    python bench.py book --book book.bin --games 1000
+    python bench.py tablebase --syzygy /path/to/syzygy --depth 5
+"""
+import argparse
+import random
+import time
+
+import chess
+
+import main
+
+# Opening, middlegame and endgame positions used by every benchmark
+BENCH_POSITIONS = [
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 4 4",
+    "r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 b - - 0 8",
+    "2r2rk1/pp1b1ppp/3qpn2/3p4/3P4/2PB1N2/PP3PPP/R2QR1K1 b - - 3 15",
+    "8/5pk1/6p1/3R4/7P/6P1/r4PK1/8 b - - 0 40",
+]
+
+# Small positions (both sides to move, mates included) for the search correctness check
+VERIFY_POSITIONS = [
+    "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    "3r2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1",
+    "8/8/8/3k4/8/2Q5/8/3K4 w - - 0 1",
+    "8/2k5/8/8/3b4/8/4PP2/4K3 b - - 0 1",
+    "4k3/8/4K3/8/8/8/8/7R w - - 0 1",
+    "r5k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1",
+    "8/5k2/8/3n4/8/2N5/5K2/8 b - - 0 1",
+]
+
+SETTINGS = main.DIFFICULTY_SETTINGS['Goat']
+
+
+def search_to_depth(fen, depth):
+    """Fixed-depth search from clean tables - returns (move, nodes, seconds)"""
+    main.tt_clear()
+    main.clear_move_heuristics()
+    main.eval_cache_clear()
+    main.pawn_hash_clear()
+    board = main.SearchBoard(fen)
+    moves = main.advanced_move_ordering(board, list(board.legal_moves), SETTINGS['aggression'], depth)
+    start = time.time()
+    main.start_search_clock(float('inf'), float('inf'))
+    move, _, _, _ = main.iterative_deepening(
+        board, moves, depth, SETTINGS['aggression'], SETTINGS['tactical_bonus'], verbose=False)
+    return move, main.search_clock.nodes, time.time() - start
+
+
+def compare_switch(name, depth, switch):
+    """Nodes and time to depth with a search feature off and on"""
+    print(f"{name}: nodes-to-depth {depth}")
+    totals = {False: [0, 0.0], True: [0, 0.0]}
+
+    for fen in BENCH_POSITIONS:
+        row = []
+        for enabled in (False, True):
+            switch(enabled)
+            move, nodes, seconds = search_to_depth(fen, depth)
+            totals[enabled][0] += nodes
+            totals[enabled][1] += seconds
+            row.append(f"{'on ' if enabled else 'off'} {move} {nodes:7d} nodes {seconds:6.2f}s")
+        print("  " + " | ".join(row))
+
+    (off_nodes, off_time), (on_nodes, on_time) = totals[False], totals[True]
+    print(f"  total: off {off_nodes} nodes {off_time:.2f}s | on {on_nodes} nodes {on_time:.2f}s | "
+          f"nodes saved {100.0 * (off_nodes - on_nodes) / max(off_nodes, 1):.1f}% | "
+          f"time saved {100.0 * (off_time - on_time) / max(off_time, 0.001):.1f}%")
+
+
+def bench_null_move(depth, verification):
+    main.NULL_MOVE_VERIFICATION = verification
+    compare_switch("Null-move pruning" + (" (verified)" if verification else ""), depth,
+                   lambda enabled: setattr(main, 'NULL_MOVE_PRUNING', enabled))
+
+
+# Selective pruning switches in main, benchmarked one at a time
+PRUNING_SWITCHES = {
+    'futility': 'FUTILITY_PRUNING',
+    'reverse-futility': 'REVERSE_FUTILITY_PRUNING',
+    'razoring': 'RAZORING',
+    'late-move': 'LATE_MOVE_PRUNING',
+    'see-qsearch': 'SEE_QSEARCH_PRUNING',
+    'delta': 'DELTA_PRUNING',
+}
+
+
+def bench_ordering(depth):
+    compare_switch("Counter-move + continuation history", depth,
+                   lambda enabled: setattr(main, 'CONTINUATION_HEURISTICS', enabled))
+
+
+def bench_pruning(depth, techniques):
+    """Each forward-pruning technique on its own, the others switched off"""
+    for technique in techniques:
+        for flag in PRUNING_SWITCHES.values():
+            setattr(main, flag, False)
+        compare_switch(technique, depth, lambda enabled: setattr(main, PRUNING_SWITCHES[technique], enabled))
+
+
+def plain_minimax(board, depth):
+    """Reference full-width negamax on the same leaves - no pruning, no table"""
+    args = (SETTINGS['aggression'], SETTINGS['tactical_bonus'])
+    if depth <= 0:
+        return main.quiescence_search(board, float('-inf'), float('inf'), main.QSEARCH_DEPTH, *args)
+    if board.is_game_over():
+        if board.is_checkmate():
+            return -main.MATE_SCORE - depth
+        return main.static_eval(board, *args)
+
+    best = float('-inf')
+    for move in list(board.legal_moves):
+        board.push(move)
+        best = max(best, -plain_minimax(board, depth - 1))
+        board.pop()
+    return best
+
+
+def verify_search(depth):
+    """Root scores of the PVS search (selective pruning and lazy eval off) must match plain minimax"""
+    for flag in list(PRUNING_SWITCHES.values()) + ['NULL_MOVE_PRUNING', 'LAZY_EVAL']:
+        setattr(main, flag, False)
+    failures = 0
+
+    for fen in VERIFY_POSITIONS:
+        main.tt_clear()
+        main.start_search_clock(float('inf'), float('inf'))
+        board = main.SearchBoard(fen)
+        expected = plain_minimax(board, depth)
+        score = main.minimax_with_pruning(board, depth, float('-inf'), float('inf'),
+                                          SETTINGS['aggression'], SETTINGS['tactical_bonus'])
+        ok = score == expected
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {fen}: pvs {score} minimax {expected}")
+
+    print(f"{len(VERIFY_POSITIONS) - failures}/{len(VERIFY_POSITIONS)} positions match at depth {depth}")
+    return failures == 0
+
+
+# Square-by-square reference versions of the bitboard evaluation terms
+def reference_tactical_motifs(board, aggression_factor):
+    score = 0
+    white_king, black_king = board.king(chess.WHITE), board.king(chess.BLACK)
+    if not white_king or not black_king:
+        return score
+    bonuses = {chess.QUEEN: 100, chess.ROOK: 70, chess.BISHOP: 45, chess.KNIGHT: 55, chess.PAWN: 25}
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece and piece.color == chess.BLACK:
+            for attack_square in board.attacks(square):
+                distance = chess.square_distance(attack_square, white_king)
+                if distance <= 3:
+                    score += bonuses.get(piece.piece_type, 0) * (4.0 - distance) * aggression_factor
+                target = board.piece_at(attack_square)
+                if target and target.color == chess.WHITE:
+                    target_value = main.PIECE_VALUES[target.piece_type]
+                    attacker_value = main.PIECE_VALUES[piece.piece_type]
+                    if target_value > attacker_value:
+                        score += (target_value - attacker_value) * 0.8 * aggression_factor
+                    elif target_value >= attacker_value:
+                        score += target_value * 0.3 * aggression_factor
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece and piece.color == chess.WHITE:
+            for attack_square in board.attacks(square):
+                if chess.square_distance(attack_square, black_king) <= 2:
+                    score -= 25
+    return score
+
+
+def reference_pawn_structure(board, aggression_factor):
+    score = 0
+    white_pawns = [sq for sq in chess.SQUARES if board.piece_at(sq) == chess.Piece(chess.PAWN, chess.WHITE)]
+    black_pawns = [sq for sq in chess.SQUARES if board.piece_at(sq) == chess.Piece(chess.PAWN, chess.BLACK)]
+    for pawn in black_pawns:
+        file, rank = chess.square_file(pawn), chess.square_rank(pawn)
+        if all(not (abs(chess.square_file(e) - file) <= 1 and chess.square_rank(e) < rank) for e in white_pawns):
+            score += (rank + 1) * (rank + 1) * 20 * aggression_factor
+            for support in (pawn - 9, pawn - 7):
+                if 0 <= support <= 63 and board.piece_at(support) == chess.Piece(chess.PAWN, chess.BLACK):
+                    score += 30 * aggression_factor
+    for pawn in white_pawns:
+        file, rank = chess.square_file(pawn), chess.square_rank(pawn)
+        if all(not (abs(chess.square_file(e) - file) <= 1 and chess.square_rank(e) > rank) for e in black_pawns):
+            score -= (6 - rank) * 18
+
+    def islands(pawns):
+        files = sorted({chess.square_file(sq) for sq in pawns})
+        return (1 if files else 0) + sum(1 for a, b in zip(files, files[1:]) if b - a > 1)
+    return score + (islands(white_pawns) - islands(black_pawns)) * 25
+
+
+def reference_piece_activity(board, aggression_factor):
+    score = 0
+    black_weights = {chess.QUEEN: 8, chess.ROOK: 6, chess.BISHOP: 4, chess.KNIGHT: 5, chess.PAWN: 3}
+    white_weights = {chess.QUEEN: 4, chess.ROOK: 3, chess.BISHOP: 2, chess.KNIGHT: 3, chess.PAWN: 2}
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece and piece.piece_type in black_weights:
+            mobility = len(board.attacks(square))
+            if piece.color == chess.BLACK:
+                score += mobility * black_weights[piece.piece_type] * aggression_factor
+            else:
+                score -= mobility * white_weights[piece.piece_type]
+    return score
+
+
+def reference_captured_pieces(board):
+    start = {'p': 8, 'r': 2, 'n': 2, 'b': 2, 'q': 1, 'k': 1}
+    symbols = {'p': '♟', 'r': '♜', 'n': '♞', 'b': '♝', 'q': '♛', 'k': '♚'}
+    captured = {}
+    for name, color in (('white', chess.WHITE), ('black', chess.BLACK)):
+        captured[name] = []
+        for symbol, count in start.items():
+            left = sum(1 for sq in chess.SQUARES if board.piece_at(sq) and board.piece_at(sq).color == color
+                       and board.piece_at(sq).symbol().lower() == symbol)
+            captured[name].extend([symbols[symbol]] * max(0, count - left))
+    return captured
+
+
+def reference_mobility_and_attacks(board, aggression_factor):
+    """Sections 4 and 10 of evaluate_board as they were: legal move generation and push/pop"""
+    score = 0
+    moves, captures = {}, {}
+    for color in (chess.WHITE, chess.BLACK):
+        flipped = board.copy(stack=False)
+        flipped.turn = color
+        moves[color] = list(flipped.legal_moves)
+        # Captures judged from the mover's side - the old code asked the unflipped board, which
+        # counted every move of the side not to move as a capture
+        captures[color] = sum(1 for move in moves[color] if flipped.is_capture(move))
+    score += (len(moves[chess.BLACK]) - len(moves[chess.WHITE])) * 8 * aggression_factor
+    score += (captures[chess.BLACK] - captures[chess.WHITE]) * 25 * aggression_factor
+
+    if board.turn == chess.BLACK:
+        for move in board.legal_moves:
+            board.push(move)
+            if board.is_check():
+                score += 150 * aggression_factor
+            targets = sum(1 for sq in board.attacks(move.to_square)
+                          if board.piece_at(sq) and board.piece_at(sq).color == chess.WHITE
+                          and main.PIECE_VALUES[board.piece_at(sq).piece_type] >= main.PIECE_VALUES[chess.KNIGHT])
+            if targets >= 2:
+                score += 80 * aggression_factor
+            board.pop()
+    return score
+
+
+def mobility_and_attacks(board, aggression_factor):
+    """The same two sections from attack masks"""
+    attack_map = main.AttackMap(board)
+    black_moves, black_captures = main.count_mobility(board, chess.BLACK, attack_map)
+    white_moves, white_captures = main.count_mobility(board, chess.WHITE, attack_map)
+    score = (black_moves - white_moves) * 8 * aggression_factor
+    score += (black_captures - white_captures) * 25 * aggression_factor
+    if board.turn == chess.BLACK:
+        score += main.evaluate_attacking_moves(board, aggression_factor, attack_map)
+    return score
+
+
+def mobility_error(games, seed=2):
+    """Error of the attack-mask mobility/tactics terms against legal move generation"""
+    rng = random.Random(seed)
+    errors, eval_sizes = [], []
+    fast_time = reference_time = 0.0
+
+    for _ in range(games):
+        board = chess.Board()
+        for _ in range(rng.randint(1, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            aggression = SETTINGS['aggression']
+            start = time.perf_counter()
+            fast = mobility_and_attacks(board, aggression)
+            fast_time += time.perf_counter() - start
+            start = time.perf_counter()
+            reference = reference_mobility_and_attacks(board, aggression)
+            reference_time += time.perf_counter() - start
+            errors.append(abs(fast - reference))
+            eval_sizes.append(abs(main.compute_evaluation(board, aggression, SETTINGS['tactical_bonus'])))
+
+    errors.sort()
+    print(f"{len(errors)} positions (Goat aggression {SETTINGS['aggression']})")
+    print(f"  mean abs error {sum(errors) / len(errors):.1f} | median {errors[len(errors) // 2]:.1f} | "
+          f"95th pct {errors[int(len(errors) * 0.95)]:.1f} | mean |eval| {sum(eval_sizes) / len(eval_sizes):.0f}")
+    print(f"  {reference_time / max(fast_time, 1e-9):.1f}x faster than legal move generation + push/pop")
+
+
+def lazy_margins(games, percentile=100.0, seed=3):
+    """Error of the partial score after tier 1 and tier 2 against the full evaluation, per difficulty.
+    Margins derived from the error percentiles (both tails), next to LAZY_EVAL_MARGINS"""
+    rng = random.Random(seed)
+    errors = {1: [], 2: []}
+    print("Full eval minus partial score (scaled like LAZY_EVAL_MARGINS): min / low pct / high pct / max")
+    for difficulty, settings in main.DIFFICULTY_SETTINGS.items():
+        aggression, tactical = settings['aggression'], settings['tactical_bonus']
+        scales = (None, aggression, aggression * tactical)
+        swings = {1: [], 2: []}
+        for _ in range(games):
+            board = chess.Board()
+            for _ in range(rng.randint(1, 150)):
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                board.push(rng.choice(moves))
+                if board.is_game_over():
+                    break
+                full = main.compute_evaluation(board, aggression, tactical)
+                growth = 1.3 if main.is_endgame(board) else 1.0
+                partial = main.evaluation_tier1(board)
+                swings[1].append((full - partial * growth) / scales[1])
+                partial += main.evaluation_tier2(board, aggression, main.AttackMap(board))
+                swings[2].append((full - partial * growth) / scales[2])
+
+        row = []
+        for tier in (1, 2):
+            low, high = error_percentiles(swings[tier], percentile)
+            row.append(f"after T{tier} {min(swings[tier]):7.0f} / {low:6.0f} / {high:6.0f} / {max(swings[tier]):7.0f}")
+            errors[tier] += swings[tier]
+        print(f"  {difficulty:7s} {len(swings[1])} positions | " + " | ".join(row))
+
+    derived = [None]
+    for tier in (1, 2):
+        low, high = error_percentiles(errors[tier], percentile)
+        derived.append((max(0, round_up(-low)), round_up(high)))
+    print(f"Margins from the {100 - percentile:g} / {percentile:g} error percentiles: {derived}")
+    for name, margins in (("derived", derived), ("LAZY_EVAL_MARGINS", main.LAZY_EVAL_MARGINS)):
+        row = []
+        for tier in (1, 2):
+            below, above = margins[tier]
+            outside = sum(1 for error in errors[tier] if error < -below or error > above)
+            row.append(f"after T{tier} {100.0 * outside / len(errors[tier]):.2f}% outside")
+        print(f"  {name:17s} {margins} | " + " | ".join(row))
+
+
+def error_percentiles(errors, percentile):
+    errors = sorted(errors)
+    last = len(errors) - 1
+    return (errors[int(last * (100 - percentile) / 100)],
+            errors[int(last * percentile / 100)])
+
+
+def round_up(value, step=50):
+    return int(-(-value // step) * step)
+
+
+def bench_lazy(depth, games, percentile):
+    lazy_margins(games, percentile)
+    compare_switch("Lazy tiered evaluation", depth, lambda enabled: setattr(main, 'LAZY_EVAL', enabled))
+
+    main.LAZY_EVAL = True
+    main.lazy_eval_stats[:] = [0, 0, 0, 0]
+    for fen in BENCH_POSITIONS:
+        search_to_depth(fen, depth)
+    print(f"  tier exits in search: {main.lazy_eval_report()} of {main.lazy_eval_stats[1]} evaluations")
+
+
+def batch_check(games, seed=4, tolerance=1e-6):
+    """NumPy batch evaluator against the scalar terms it vectorizes, and positions per second"""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(games):
+        board = chess.Board()
+        for _ in range(rng.randint(1, 150)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            boards.append(board.copy(stack=False))
+
+    aggression = SETTINGS['aggression']
+    main.evaluate_batch(boards[:2], aggression)  # Build the tables outside the timing
+    start = time.perf_counter()
+    batch = main.evaluate_batch(boards, aggression)
+    batch_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scalar = [main.structure_evaluation(board, aggression) for board in boards]
+    scalar_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for board in boards[:500]:
+        main.compute_evaluation(board, aggression, SETTINGS['tactical_bonus'])
+    full_rate = min(len(boards), 500) / (time.perf_counter() - start)
+
+    worst = max(abs(float(fast) - slow) for fast, slow in zip(batch, scalar))
+    print(f"{len(boards)} positions: max |batch - scalar| {worst:.2e} "
+          f"({'ok' if worst <= tolerance else 'MISMATCH'}, tolerance {tolerance:g})")
+    print(f"  batch {len(boards) / batch_time:.0f} pos/s | scalar same terms {len(boards) / scalar_time:.0f} pos/s | "
+          f"full evaluate_board {full_rate:.0f} pos/s")
+
+
+def book_probes(path, games):
+    """Play book lines until they run out - probe cost, hit rate and line length"""
+    if path:
+        main.OPENING_BOOK = path
+    if main.get_book_reader() is None:
+        print(f"No opening book at {main.OPENING_BOOK}")
+        return
+
+    probe_time, probes, line_plies = 0.0, 0, 0
+    for _ in range(games):
+        board = main.SearchBoard()
+        while True:
+            start = time.perf_counter()
+            move = main.probe_book(board)
+            probe_time += time.perf_counter() - start
+            probes += 1
+            if move is None:
+                break
+            board.push(move)
+            line_plies += 1
+
+    print(f"{games} book lines: {line_plies / games:.1f} plies on average (limit {main.BOOK_MAX_PLY}) | "
+          f"hits {main.book_stats['hits']}/{main.book_stats['probes']} ({main.book_hit_rate():.0f}%)")
+    print(f"  {1e6 * probe_time / probes:.0f} us per probe")
+
+
+# Endgames that reach the tables at the root (3-5 pieces) or only after a capture (6 pieces)
+TABLEBASE_POSITIONS = [
+    "8/8/8/4k3/8/8/8/KQ6 w - - 0 1",
+    "8/8/4k3/8/8/2K5/3R4/8 b - - 0 1",
+    "8/8/8/3k4/8/3KP3/8/8 w - - 0 1",
+    "8/5k2/8/8/3R4/8/2r2PK1/8 w - - 0 1",
+    "8/5k2/8/5p2/3R4/8/2r2PK1/8 w - - 0 1",
+]
+
+
+def tablebase_probes(path, depth):
+    """Root tablebase moves and in-search WDL cutoffs, with probe counts and time"""
+    if path:
+        main.SYZYGY_PATH = path
+    if main.get_tablebase() is None:
+        print(f"No Syzygy tables under {main.SYZYGY_PATH or '(CHESS_AI_SYZYGY unset)'}")
+        return
+
+    for fen in TABLEBASE_POSITIONS:
+        main.tablebase_stats.update(probes=0, hits=0)
+        board = main.SearchBoard(fen)
+        start = time.perf_counter()
+        root = main.probe_root_tablebase(board)
+        if root:
+            move, wdl = root
+            result = f"root {move} WDL {wdl:+d}"
+        else:
+            move, nodes, _ = search_to_depth(fen, depth)
+            result = f"search {move} {nodes} nodes"
+        print(f"  {fen}: {result} | {time.perf_counter() - start:.3f}s | "
+              f"TB hits {main.tablebase_stats['hits']}/{main.tablebase_stats['probes']}")
+
+
+def eval_check(games, seed=1):
+    """Bitboard evaluation terms against the square-scan reference on random game positions.
+    The fast terms get the AttackMap the evaluation builds once and shares - its cost is shown apart"""
+    rng = random.Random(seed)
+    terms = [
+        ('tactical motifs', main.evaluate_tactical_motifs, reference_tactical_motifs, True),
+        ('pawn structure', main.evaluate_pawn_structure, reference_pawn_structure, False),
+        ('piece activity', main.evaluate_piece_activity, reference_piece_activity, True),
+    ]
+    timings = {name: [0.0, 0.0] for name, _, _, _ in terms}
+    map_time = 0.0
+    positions = mismatches = 0
+
+    for board, aggression in random_positions(games, rng):
+        positions += 1
+        start = time.perf_counter()
+        attack_map = main.AttackMap(board)
+        map_time += time.perf_counter() - start
+        for name, fast, reference, uses_map in terms:
+            start = time.perf_counter()
+            fast_score = fast(board, aggression, attack_map) if uses_map else fast(board, aggression)
+            timings[name][0] += time.perf_counter() - start
+            start = time.perf_counter()
+            reference_score = reference(board, aggression)
+            timings[name][1] += time.perf_counter() - start
+            if abs(fast_score - reference_score) > 1e-6:
+                mismatches += 1
+                print(f"  MISMATCH {name}: {board.fen()} {fast_score} != {reference_score}")
+        if main.get_captured_pieces(board) != reference_captured_pieces(board):
+            mismatches += 1
+            print(f"  MISMATCH captured pieces: {board.fen()}")
+
+    for name, (fast_time, reference_time) in timings.items():
+        print(f"  {name}: {reference_time / max(fast_time, 1e-9):.1f}x faster than the square scan")
+    print(f"  shared AttackMap build: {1e6 * map_time / max(positions, 1):.0f} us per position")
+    print(f"{positions} positions, {mismatches} mismatches")
+    return mismatches == 0
+
+
+def random_positions(games, rng):
+    """(board, aggression) along random games - the same board object, one move further each time"""
+    aggressions = [settings['aggression'] for settings in main.DIFFICULTY_SETTINGS.values()]
+    for _ in range(games):
+        board = chess.Board()
+        for _ in range(rng.randint(1, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            yield board, rng.choice(aggressions)
+
+
+def bench_smp(depth, worker_counts, think_time):
+    """Time-to-depth and speedup of Lazy SMP against a single worker"""
+    print(f"Lazy SMP time-to-depth {depth} on {len(BENCH_POSITIONS)} positions")
+    baseline = None
+
+    for workers in worker_counts:
+        total_time = 0.0
+        reached = []
+        for fen in BENCH_POSITIONS:
+            main.tt_clear()
+            board = main.SearchBoard(fen)
+            start = time.time()
+            main.start_search_clock(think_time, think_time)
+            _, _, _, completed = main.lazy_smp_search(
+                board, depth, SETTINGS['aggression'], SETTINGS['tactical_bonus'], workers)
+            total_time += time.time() - start
+            reached.append(completed)
+
+        if baseline is None:
+            baseline = total_time
+        speedup = baseline / max(total_time, 0.001)
+        print(f"  workers={workers:2d}  time={total_time:7.2f}s  speedup={speedup:5.2f}x  depths={reached}")
+
+
+def bench_distributed(depth, hosts, local_workers, think_time):
+    """Young Brothers Wait root splitting against a plain local search"""
+    processes = []
+    if not hosts:
+        hosts, processes = main.start_local_workers(local_workers)
+    print(f"Distributed root splitting to depth {depth} over {len(hosts)} hosts")
+
+    try:
+        for fen in BENCH_POSITIONS:
+            timings = []
+            for use_hosts in (False, True):
+                main.tt_clear()
+                board = main.SearchBoard(fen)
+                moves = main.advanced_move_ordering(board, list(board.legal_moves), SETTINGS['aggression'], depth)
+                start = time.time()
+                main.start_search_clock(think_time, think_time)
+                if use_hosts:
+                    move, score, nodes, _ = main.distributed_root_search(
+                        board, moves, depth, SETTINGS['aggression'], SETTINGS['tactical_bonus'], hosts)
+                else:
+                    move, score, nodes, _ = main.iterative_deepening(
+                        board, moves, depth, SETTINGS['aggression'], SETTINGS['tactical_bonus'], verbose=False)
+                timings.append((time.time() - start, move, score, nodes))
+            (local_time, local_move, local_score, local_nodes), (farm_time, farm_move, farm_score, farm_nodes) = timings
+            print(f"  local {local_move} {local_score} {local_nodes} nodes in {local_time:.2f}s | "
+                  f"farm {farm_move} {farm_score} {farm_nodes} nodes in {farm_time:.2f}s | "
+                  f"speedup {local_time / max(farm_time, 0.001):.2f}x")
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    smp = commands.add_parser('smp', help="Lazy SMP speedup vs cores")
+    smp.add_argument('--depth', type=int, default=3)
+    smp.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, main.SMP_WORKERS])
+    smp.add_argument('--think-time', type=float, default=600.0)
+
+    distributed = commands.add_parser('distributed', help="Root splitting over analysis hosts")
+    distributed.add_argument('--depth', type=int, default=3)
+    distributed.add_argument('--hosts', nargs='*', default=[])
+    distributed.add_argument('--local-workers', type=int, default=4)
+    distributed.add_argument('--think-time', type=float, default=600.0)
+
+    nullmove = commands.add_parser('nullmove', help="Nodes-to-depth with and without null-move pruning")
+    nullmove.add_argument('--depth', type=int, default=3)
+    nullmove.add_argument('--verify', action='store_true')
+
+    pruning = commands.add_parser('pruning', help="Nodes-to-depth per selective pruning technique")
+    pruning.add_argument('--depth', type=int, default=3)
+    pruning.add_argument('--techniques', nargs='+', choices=list(PRUNING_SWITCHES), default=list(PRUNING_SWITCHES))
+
+    ordering = commands.add_parser('ordering', help="Nodes-to-depth with and without counter-move/continuation history")
+    ordering.add_argument('--depth', type=int, default=3)
+
+    verify = commands.add_parser('verify', help="PVS search against plain minimax on small positions")
+    verify.add_argument('--depth', type=int, default=2)
+
+    evalcheck = commands.add_parser('evalcheck', help="Bitboard eval terms against the square-scan reference")
+    evalcheck.add_argument('--games', type=int, default=200)
+
+    mobility = commands.add_parser('mobility', help="Attack-mask mobility/tactics error vs legal move generation")
+    mobility.add_argument('--games', type=int, default=100)
+
+    lazy = commands.add_parser('lazy', help="Lazy tiered evaluation: margin check, nodes-to-depth and tier counts")
+    lazy.add_argument('--depth', type=int, default=3)
+    lazy.add_argument('--games', type=int, default=50)
+    lazy.add_argument('--percentile', type=float, default=100.0,
+                      help="Error percentile the margins cover (100: worst case seen)")
+
+    batch = commands.add_parser('batch', help="NumPy batch evaluator against the scalar terms")
+    batch.add_argument('--games', type=int, default=200)
+
+    book = commands.add_parser('book', help="Opening book probe cost and hit rate")
+    book.add_argument('--book', default=None, help="Polyglot .bin file (default: main.OPENING_BOOK)")
+    book.add_argument('--games', type=int, default=1000)
+
+    tablebase = commands.add_parser('tablebase', help="Syzygy root moves and search cutoffs")
+    tablebase.add_argument('--syzygy', default=None, help="Table directories (default: main.SYZYGY_PATH)")
+    tablebase.add_argument('--depth', type=int, default=5)
+
+    args = parser.parse_args()
+    if args.command == 'smp':
+        bench_smp(args.depth, args.workers, args.think_time)
+    elif args.command == 'distributed':
+        bench_distributed(args.depth, args.hosts, args.local_workers, args.think_time)
+    elif args.command == 'nullmove':
+        bench_null_move(args.depth, args.verify)
+    elif args.command == 'pruning':
+        bench_pruning(args.depth, args.techniques)
+    elif args.command == 'ordering':
+        bench_ordering(args.depth)
+    elif args.command == 'tablebase':
+        tablebase_probes(args.syzygy, args.depth)
+    elif args.command == 'book':
+        book_probes(args.book, args.games)
+    elif args.command == 'batch':
+        batch_check(args.games)
+    elif args.command == 'lazy':
+        bench_lazy(args.depth, args.games, args.percentile)
+    elif args.command == 'mobility':
+        mobility_error(args.games)
+    elif args.command == 'evalcheck':
+        raise SystemExit(0 if eval_check(args.games) else 1)
+    elif args.command == 'verify':
+        raise SystemExit(0 if verify_search(args.depth) else 1)
+
+
+if __name__ == "__main__":
+    run()
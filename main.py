@@ -1,9 +1,25 @@
 import pygame
 import chess
+import chess.polyglot
+import chess.syzygy
+import array
+import ctypes
 import random
 import time
 import threading
 import math
+import os
+import multiprocessing
+import queue
+import json
+import socket
+import sys
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:  # Only the offline batch evaluator needs it
+    np = None
 
 # Enhanced Pygame setup - BIGGER BOARD
 WIDTH, HEIGHT = 800, 640
@@ -22,19 +38,528 @@ ORANGE = (255, 165, 0)
 PURPLE = (128, 0, 128)
 DARK_RED = (139, 0, 0)
 
+# Lazy SMP helper processes for the strongest levels
+SMP_WORKERS = max(1, min(16, os.cpu_count() or 1))
+SMP_SKIP_CYCLE = 3        # Helper i skips depth d when (d + i) % SMP_SKIP_CYCLE == 0 - helpers spread over depths
+SMP_ROOT_JITTER = 4.0     # Helpers shuffle their root moves by up to about this many places
+SMP_HISTORY_JITTER = 64   # Random history bonus per quiet move in every helper
+
+# Remote analysis workers ("host:port" or "unix:/path"), e.g. CHESS_AI_HOSTS=box1:7777,box2:7777
+ANALYSIS_HOSTS = [host for host in os.environ.get('CHESS_AI_HOSTS', '').split(',') if host]
+
+# Polyglot opening book (book.bin next to main.py by default) and how many plies it's played for
+OPENING_BOOK = os.environ.get('CHESS_AI_BOOK', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book.bin'))
+BOOK_MAX_PLY = int(os.environ.get('CHESS_AI_BOOK_PLIES', '20'))
+
+# Syzygy endgame tablebase directories (WDL .rtbw / DTZ .rtbz), separated like PATH
+SYZYGY_PATH = os.environ.get('CHESS_AI_SYZYGY', '')
+
 # INSANE difficulty settings - AI WILL DOMINATE
 DIFFICULTY_SETTINGS = {
-    'Easy': {'depth': 5, 'randomness': 0.05, 'think_time': 1.0, 'aggression': 2.0, 'tactical_bonus': 1.5},
-    'Medium': {'depth': 6, 'randomness': 0.02, 'think_time': 2.0, 'aggression': 2.8, 'tactical_bonus': 2.0},
-    'Hard': {'depth': 7, 'randomness': 0.0, 'think_time': 3.5, 'aggression': 3.5, 'tactical_bonus': 2.5},
-    'Expert': {'depth': 8, 'randomness': 0.0, 'think_time': 5.0, 'aggression': 4.2, 'tactical_bonus': 3.0},
-    'Goat': {'depth': 9, 'randomness': 0.0, 'think_time': 8.0, 'aggression': 5.0, 'tactical_bonus': 4.0}
+    'Easy': {'depth': 5, 'randomness': 0.05, 'think_time': 1.0, 'aggression': 2.0, 'tactical_bonus': 1.5, 'workers': 1},
+    'Medium': {'depth': 6, 'randomness': 0.02, 'think_time': 2.0, 'aggression': 2.8, 'tactical_bonus': 2.0, 'workers': 1},
+    'Hard': {'depth': 7, 'randomness': 0.0, 'think_time': 3.5, 'aggression': 3.5, 'tactical_bonus': 2.5, 'workers': 1},
+    'Expert': {'depth': 8, 'randomness': 0.0, 'think_time': 5.0, 'aggression': 4.2, 'tactical_bonus': 3.0, 'workers': SMP_WORKERS},
+    'Goat': {'depth': 9, 'randomness': 0.0, 'think_time': 8.0, 'aggression': 5.0, 'tactical_bonus': 4.0, 'workers': SMP_WORKERS}
 }
 
-# Global transposition table with deeper storage
-transposition_table = {}
-killer_moves = {}  # Killer move heuristic
-history_table = {}  # History heuristic
+# Global transposition table - fixed size, Zobrist keyed, shared with SMP workers
+TT_SIZE_MB = 64
+TT_ENTRY_BYTES = 16  # 8 byte key (xor data) + 8 byte packed data word
+TT_EXACT = 1
+TT_LOWERBOUND = 2
+TT_UPPERBOUND = 3
+TT_SCORE_OFFSET = 1 << 31
+
+tt_shared = None  # (raw keys, raw data, mask) - handed to worker processes
+tt_keys = None
+tt_data = None
+tt_mask = 0
+tt_generation = 0
+
+search_stop = None  # Event set by the SMP coordinator to halt a worker
+
+# Time management
+TIME_CHECK_INTERVAL = 32    # Nodes between clock reads
+SOFT_TIME_RATIO = 0.6       # No new iteration after this share of think_time
+INSTABILITY_EXTENSION = 1.5 # Soft limit stretch when the best move changes
+CLOCK_SAFETY_MARGIN = 0.3   # Seconds never spent from a game clock
+DEFAULT_MOVES_TO_GO = 30
+MATE_SCORE = 100000
+MATE_THRESHOLD = 90000      # Scores beyond this are forced mates
+
+# Null-move pruning
+NULL_MOVE_PRUNING = True
+NULL_MOVE_VERIFICATION = False  # Re-search at reduced depth before trusting a null cutoff
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2         # R, plus one from NULL_MOVE_DEEP_DEPTH on
+NULL_MOVE_DEEP_DEPTH = 6
+
+# Selective forward pruning - margins indexed by remaining depth
+FUTILITY_PRUNING = True
+FUTILITY_MARGINS = [0, 250, 500, 800]           # Skip quiet moves that can't lift the eval past alpha
+REVERSE_FUTILITY_PRUNING = True
+REVERSE_FUTILITY_MARGINS = [0, 200, 400, 600, 800]  # Static null move: eval already this far above beta
+RAZORING = True
+RAZOR_MARGINS = [0, 400, 700]                   # Eval this far below alpha drops straight into qsearch
+LATE_MOVE_PRUNING = True
+LATE_MOVE_COUNTS = [0, 8, 12, 18]               # Quiet moves searched before the rest are skipped
+SEE_QSEARCH_PRUNING = True                      # Quiescence skips captures with a losing exchange
+LATE_MOVE_REDUCTIONS = True                     # Quiet moves late in the list search a ply shallower first
+
+# Quiescence search
+QSEARCH_DEPTH = 3      # Capture plies searched past the horizon (quiet checks on the first)
+DELTA_PRUNING = True
+DELTA_MARGIN = 200     # Safety margin on top of the captured material
+
+# Aspiration windows
+ASPIRATION_WINDOW = 150
+ASPIRATION_MAX_WINDOW = 5000  # Beyond this the bound opens up completely
+ASPIRATION_MIN_DEPTH = 3
+
+# Result of the last completed iteration (principal variation included)
+search_info = {'depth': 0, 'score': 0, 'pv': []}
+
+
+class SearchClock(threading.local):
+    """Per-thread search clock - unlimited until start_search_clock() sets limits"""
+
+    def __init__(self):
+        self.start = time.time()
+        self.soft_time = self.base_soft_time = self.hard_time = float('inf')
+        self.nodes = 0
+        self.next_check = TIME_CHECK_INTERVAL
+        self.stopped = False
+
+
+search_clock = SearchClock()
+
+# Pondering - search the predicted human reply while the human thinks
+PONDER_ENABLED = True
+ponder_state = {
+    'thread': None,      # Background search thread
+    'move': None,        # Predicted human move being pondered
+    'active': False,     # Clock is ignored while pondering...
+    'hit_time': None,    # ...until a ponder hit starts the real time budget
+    'stop': threading.Event(),
+    'lock': threading.Lock(),
+    'hit': False,
+    'result': None
+}
+
+# Move ordering heuristics - two killer slots per ply, history per [color][from][to]
+KILLER_PLIES = 128
+HISTORY_MAX = 1 << 20  # Every history entry is halved once one grows past this
+KILLER_BONUS = 900     # Ordering bonus of the first killer slot (second gets 100 less)
+killer_moves = array.array('H', [0]) * (KILLER_PLIES * 2)  # encode_move() codes
+history_table = array.array('i', [0]) * (2 * 64 * 64)
+# Halving is lazy: it bumps history_generation, and each entry is shifted right by the
+# generations since its stamp when next read or written - no pass over the tables
+history_generation = 0
+history_stamps = array.array('I', [0]) * len(history_table)
+
+# Counter-move and continuation history - quiet moves judged by what was just played
+CONTINUATION_HEURISTICS = True
+COUNTER_MOVE_BONUS = 600
+PIECE_SQUARE_KEYS = 12 * 64  # (color, piece, to-square)
+counter_moves = array.array('H', [0]) * (64 * 64)  # Reply to the opponent's [from][to]
+continuation_history = [array.array('i', [0]) * (PIECE_SQUARE_KEYS * PIECE_SQUARE_KEYS)
+                        for _ in range(2)]  # Keyed by the move 1 and 2 plies back
+continuation_stamps = [array.array('I', [0]) * len(table) for table in continuation_history]
+
+# Polyglot Zobrist keys (same numbers the opening book format uses)
+ZOBRIST_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+ZOBRIST_TURN = ZOBRIST_RANDOM[780]
+ZOBRIST_CASTLING = [0] * 16
+for _rights in range(16):
+    for _bit in range(4):
+        if _rights & (1 << _bit):
+            ZOBRIST_CASTLING[_rights] ^= ZOBRIST_RANDOM[768 + _bit]
+# White kingside, white queenside, black kingside, black queenside
+CASTLING_CORNERS = [(chess.BB_H1, 1), (chess.BB_A1, 2), (chess.BB_H8, 4), (chess.BB_A8, 8)]
+
+
+def zobrist_piece(piece_type, color, square):
+    """Zobrist key of one piece on one square"""
+    return ZOBRIST_RANDOM[64 * ((piece_type - 1) * 2 + (1 if color else 0)) + square]
+
+
+class SearchBoard(chess.Board):
+    """Board that keeps its 64-bit Zobrist key and its material/piece-square totals
+    up to date on every push/pop"""
+
+    def __init__(self, fen=chess.STARTING_FEN, *, chess960=False):
+        super().__init__(fen, chess960=chess960)
+        self._zobrist_stack = [chess.polyglot.zobrist_hash(self)]
+        self._material_stack = [scan_material(self)]
+        self._pawn_key_stack = [scan_pawn_key(self)]
+
+    def zobrist_key(self):
+        return self._zobrist_stack[-1]
+
+    def material(self):
+        """(middlegame totals, endgame totals, phase) - totals indexed by color"""
+        return self._material_stack[-1]
+
+    def pawn_key(self):
+        return self._pawn_key_stack[-1]
+
+    def _zobrist_state(self):
+        """Castling, en passant and side to move part of the key"""
+        key = ZOBRIST_TURN if self.turn == chess.WHITE else 0
+
+        if self.castling_rights:
+            clean_rights = self.clean_castling_rights()
+            rights = 0
+            for corner, bit in CASTLING_CORNERS:
+                if clean_rights & corner:
+                    rights |= bit
+            key ^= ZOBRIST_CASTLING[rights]
+
+        if self.ep_square is not None:
+            if self.turn == chess.WHITE:
+                ep_mask = chess.shift_down(chess.BB_SQUARES[self.ep_square])
+            else:
+                ep_mask = chess.shift_up(chess.BB_SQUARES[self.ep_square])
+            ep_mask = chess.shift_left(ep_mask) | chess.shift_right(ep_mask)
+            if ep_mask & self.pawns & self.occupied_co[self.turn]:
+                key ^= ZOBRIST_RANDOM[772 + chess.square_file(self.ep_square)]
+
+        return key
+
+    def push(self, move):
+        key = self._zobrist_stack[-1] ^ self._zobrist_state()
+        middlegame, endgame, phase = self._material_stack[-1]
+        pawn_key = self._pawn_key_stack[-1]
+
+        if move:
+            color = self.turn
+            from_square = move.from_square
+            to_square = move.to_square
+            piece_type = self.piece_type_at(from_square)
+            removed = [(piece_type, color, from_square)]
+
+            if piece_type == chess.KING and self.is_castling(move):
+                rank = chess.square_rank(from_square)
+                if chess.square_file(to_square) < chess.square_file(from_square):
+                    king_to, rook_from, rook_to = chess.square(2, rank), chess.square(0, rank), chess.square(3, rank)
+                else:
+                    king_to, rook_from, rook_to = chess.square(6, rank), chess.square(7, rank), chess.square(5, rank)
+                removed.append((chess.ROOK, color, rook_from))
+                added = [(chess.KING, color, king_to), (chess.ROOK, color, rook_to)]
+            else:
+                captured_type = self.piece_type_at(to_square)
+                if captured_type:
+                    removed.append((captured_type, not color, to_square))
+                elif piece_type == chess.PAWN and to_square == self.ep_square:
+                    capture_square = to_square - 8 if color == chess.WHITE else to_square + 8
+                    removed.append((chess.PAWN, not color, capture_square))
+                added = [(move.promotion or piece_type, color, to_square)]
+
+            middlegame, endgame = list(middlegame), list(endgame)
+            for sign, pieces in ((-1, removed), (1, added)):
+                for piece_type, piece_color, square in pieces:
+                    key ^= zobrist_piece(piece_type, piece_color, square)
+                    if piece_type == chess.PAWN:
+                        pawn_key ^= zobrist_piece(piece_type, piece_color, square)
+                    middlegame[piece_color] += sign * PST_MIDDLE_GAME[piece_color][piece_type][square]
+                    endgame[piece_color] += sign * PST_END_GAME[piece_color][piece_type][square]
+                    phase += sign * PHASE_WEIGHTS[piece_type]
+
+        super().push(move)
+        self._zobrist_stack.append(key ^ self._zobrist_state())
+        self._material_stack.append((middlegame, endgame, phase))
+        self._pawn_key_stack.append(pawn_key)
+
+    def pop(self):
+        move = super().pop()
+        self._zobrist_stack.pop()
+        self._material_stack.pop()
+        self._pawn_key_stack.pop()
+        return move
+
+    def copy(self, *, stack=True):
+        board = super().copy(stack=stack)
+        if stack is True:
+            board._zobrist_stack = self._zobrist_stack[:]
+            board._material_stack = self._material_stack[:]
+            board._pawn_key_stack = self._pawn_key_stack[:]
+        elif stack:
+            board._zobrist_stack = self._zobrist_stack[-(stack + 1):]
+            board._material_stack = self._material_stack[-(stack + 1):]
+            board._pawn_key_stack = self._pawn_key_stack[-(stack + 1):]
+        else:
+            board._zobrist_stack = [self._zobrist_stack[-1]]
+            board._material_stack = [self._material_stack[-1]]
+            board._pawn_key_stack = [self._pawn_key_stack[-1]]
+        return board
+
+
+def scan_pawn_key(board):
+    """Zobrist key of the pawns alone - SearchBoard keeps it incrementally"""
+    key = 0
+    for color in chess.COLORS:
+        for square in chess.scan_forward(board.pawns & board.occupied_co[color]):
+            key ^= zobrist_piece(chess.PAWN, color, square)
+    return key
+
+
+def to_search_board(board):
+    """Replay a game onto a SearchBoard so repetition history is kept"""
+    search_board = SearchBoard(board.root().fen())
+    for move in board.move_stack:
+        search_board.push(move)
+    return search_board
+
+
+def position_key(board):
+    """Zobrist key of the position (incremental on a SearchBoard)"""
+    if isinstance(board, SearchBoard):
+        return board.zobrist_key()
+    return chess.polyglot.zobrist_hash(board)
+
+
+def encode_move(move):
+    if move is None:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code):
+    if not code:
+        return None
+    return chess.Move(code & 63, (code >> 6) & 63, (code >> 12) or None)
+
+
+def tt_resize(size_mb):
+    """Allocate a fresh table of 2-entry buckets holding at most size_mb megabytes"""
+    entries = max(2, (size_mb * 1024 * 1024) // TT_ENTRY_BYTES)
+    buckets = 1
+    while buckets * 4 <= entries:
+        buckets *= 2
+    tt_attach((multiprocessing.RawArray('Q', buckets * 2),
+               multiprocessing.RawArray('Q', buckets * 2),
+               buckets - 1))
+
+
+def tt_attach(shared):
+    """Point the table at shared memory (also used inside SMP workers)"""
+    global tt_shared, tt_keys, tt_data, tt_mask
+    tt_shared = shared
+    raw_keys, raw_data, tt_mask = shared
+    tt_keys = memoryview(raw_keys).cast('B').cast('Q')
+    tt_data = memoryview(raw_data).cast('B').cast('Q')
+
+
+def tt_clear():
+    """Wipe every entry for a new game - zeroed in place, so SMP workers keep their view of the table"""
+    global tt_generation
+    raw_keys, raw_data, _ = tt_shared
+    for raw in (raw_keys, raw_data):
+        ctypes.memset(ctypes.addressof(raw), 0, ctypes.sizeof(raw))
+    tt_generation = 0
+
+
+def tt_new_search():
+    """Bump the generation so entries from older searches get replaced first"""
+    global tt_generation
+    tt_generation = (tt_generation + 1) & 63
+
+
+eval_salts = {}
+
+def eval_salt(aggression_factor, tactical_bonus):
+    """Key salt per evaluation setting - a difficulty change never reuses foreign scores"""
+    salt = eval_salts.get((aggression_factor, tactical_bonus))
+    if salt is None:
+        salt = random.Random(f"{aggression_factor}:{tactical_bonus}").getrandbits(64)
+        eval_salts[(aggression_factor, tactical_bonus)] = salt
+    return salt
+
+
+def age_search_state():
+    """New search - age the hash, killer and history tables instead of wiping them"""
+    tt_new_search()
+    age_move_heuristics()
+    eval_cache_stats.update(hits=0, misses=0)  # Cached scores stay valid - only the counters restart
+    pawn_hash_stats.update(hits=0, misses=0)
+    lazy_eval_stats[:] = [0, 0, 0, 0]
+    tablebase_stats.update(probes=0, hits=0)
+
+
+def killer_index(board):
+    return (board.ply() % KILLER_PLIES) * 2
+
+def history_index(color, move):
+    return (color * 64 + move.from_square) * 64 + move.to_square
+
+def get_killers(board):
+    """The two killer moves stored for this ply (None when empty)"""
+    index = killer_index(board)
+    return decode_move(killer_moves[index]), decode_move(killer_moves[index + 1])
+
+def history_value(table, stamps, slot):
+    """Entry with the halvings since it was last written applied"""
+    shift = history_generation - stamps[slot]
+    return table[slot] >> shift if shift < 32 else 0
+
+def history_add(table, stamps, slot, bonus):
+    """Bring the entry up to date, add bonus and return the new value"""
+    value = history_value(table, stamps, slot) + bonus
+    table[slot] = value
+    stamps[slot] = history_generation
+    return value
+
+def history_score(board, move):
+    return history_value(history_table, history_stamps, history_index(board.turn, move))
+
+def piece_square_key(piece_type, color, square):
+    return ((piece_type - 1) + 6 * color) * 64 + square
+
+def continuation_keys(board):
+    """(piece, to-square) keys of the moves 1 and 2 plies back - None for no move / null move"""
+    keys = []
+    stack = board.move_stack
+    for back in (1, 2):
+        key = None
+        if len(stack) >= back and stack[-back]:
+            square = stack[-back].to_square
+            piece = board.piece_at(square)
+            # Two plies back the piece may have been captured on that square since
+            if piece and (back == 1 or stack[-1].to_square != square):
+                key = piece_square_key(piece.piece_type, piece.color, square)
+        keys.append(key)
+    return keys
+
+def ordering_context(board):
+    """Per-node inputs of quiet_move_score: the counter move and the continuation keys"""
+    if not CONTINUATION_HEURISTICS:
+        return None, (None, None)
+    counter = None
+    if board.move_stack and board.move_stack[-1]:
+        previous = board.move_stack[-1]
+        counter = decode_move(counter_moves[previous.from_square * 64 + previous.to_square])
+    return counter, continuation_keys(board)
+
+def quiet_move_score(board, move, context):
+    """History plus counter-move and continuation history for a quiet move"""
+    score = history_score(board, move)
+    counter, keys = context
+    if move == counter:
+        score += COUNTER_MOVE_BONUS
+    
+    piece_type = board.piece_type_at(move.from_square)
+    if piece_type:
+        index = piece_square_key(piece_type, board.turn, move.to_square)
+        for table, stamps, key in zip(continuation_history, continuation_stamps, keys):
+            if key is not None:
+                score += history_value(table, stamps, key * PIECE_SQUARE_KEYS + index)
+    return score
+
+def record_cutoff(board, move, depth):
+    """A quiet move failed high - make it this ply's killer and reward its history"""
+    index = killer_index(board)
+    code = encode_move(move)
+    if killer_moves[index] != code:
+        killer_moves[index + 1] = killer_moves[index]
+        killer_moves[index] = code
+    
+    bonus = depth * depth
+    overflow = history_add(history_table, history_stamps, history_index(board.turn, move), bonus) > HISTORY_MAX
+    
+    if CONTINUATION_HEURISTICS and board.move_stack and board.move_stack[-1]:
+        previous = board.move_stack[-1]
+        counter_moves[previous.from_square * 64 + previous.to_square] = code
+        
+        piece_type = board.piece_type_at(move.from_square)
+        index = piece_square_key(piece_type, board.turn, move.to_square)
+        for table, stamps, key in zip(continuation_history, continuation_stamps, continuation_keys(board)):
+            if key is not None:
+                value = history_add(table, stamps, key * PIECE_SQUARE_KEYS + index, bonus)
+                overflow = overflow or value > HISTORY_MAX
+    
+    if overflow:
+        halve_history()
+
+def halve_history():
+    global history_generation
+    history_generation += 1
+
+def age_move_heuristics():
+    """New search - killers belong to the old tree, history keeps half its weight"""
+    killer_moves[:] = array.array('H', [0]) * len(killer_moves)
+    halve_history()
+
+def clear_move_heuristics():
+    """New game - forget killers and history entirely"""
+    global history_generation
+    killer_moves[:] = array.array('H', [0]) * len(killer_moves)
+    counter_moves[:] = array.array('H', [0]) * len(counter_moves)
+    for table in [history_table] + continuation_history:
+        table[:] = array.array('i', [0]) * len(table)
+    for stamps in [history_stamps] + continuation_stamps:
+        stamps[:] = array.array('I', [0]) * len(stamps)
+    history_generation = 0
+
+
+def tt_probe(key):
+    """Returns (depth, score, bound, best_move) or None"""
+    index = (key & tt_mask) << 1
+    for slot in (index, index + 1):
+        data = tt_data[slot]
+        # Keys are stored xor data so a torn write from another process never matches
+        if data and tt_keys[slot] ^ data == key:
+            score = (data & 0xFFFFFFFF) - TT_SCORE_OFFSET
+            move = decode_move((data >> 32) & 0xFFFF)
+            depth = (data >> 48) & 0xFF
+            bound = (data >> 56) & 3
+            return depth, score, bound, move
+    return None
+
+
+def tt_store(key, depth, score, bound, best_move=None):
+    """Depth and age aware replacement inside a 2-entry bucket"""
+    if score != score or score in (float('inf'), float('-inf')):
+        return
+    index = (key & tt_mask) << 1
+
+    if tt_keys[index] ^ tt_data[index] == key:
+        slot = index
+    elif tt_keys[index + 1] ^ tt_data[index + 1] == key:
+        slot = index + 1
+    else:
+        # Replace the entry that is shallowest once older generations are penalized
+        worth = []
+        for candidate in (index, index + 1):
+            data = tt_data[candidate]
+            if not data:
+                worth.append(-1000)
+                continue
+            age = (tt_generation - (data >> 58)) & 63
+            worth.append(((data >> 48) & 0xFF) - 8 * age)
+        slot = index if worth[0] <= worth[1] else index + 1
+
+    move_code = encode_move(best_move)
+    old_data = tt_data[slot]
+    if tt_keys[slot] ^ old_data == key:
+        # Same position - a deeper result from this search stays unless the new one is exact
+        if bound != TT_EXACT and ((old_data >> 48) & 0xFF) > depth and (old_data >> 58) == tt_generation:
+            return
+        if not move_code:
+            move_code = (old_data >> 32) & 0xFFFF  # Keep the old best move
+
+    score = max(-TT_SCORE_OFFSET, min(TT_SCORE_OFFSET - 1, int(score)))
+    depth = max(0, min(255, depth))
+    data = ((score + TT_SCORE_OFFSET)
+            | (move_code << 32)
+            | (depth << 48)
+            | (bound << 56)
+            | (tt_generation << 58))
+    tt_keys[slot] = key ^ data
+    tt_data[slot] = data
+
+
+tt_resize(TT_SIZE_MB)
 
 def load_images():
     """Load chess piece images with enhanced visuals"""
@@ -236,6 +761,12 @@ PIECE_VALUES = {
     chess.KING: 0
 }
 
+# Exchange values - the king can always be "captured" last, at a price nobody pays
+SEE_VALUES = dict(PIECE_VALUES)
+SEE_VALUES[0] = 0
+SEE_VALUES[chess.KING] = 20000
+LOSING_CAPTURE_SCORE = -100000  # Ordering score pushing SEE-losing captures behind quiet moves
+
 # ULTRA AGGRESSIVE position tables
 PAWN_TABLE = [
     [0,   0,   0,   0,   0,   0,   0,   0],
@@ -303,73 +834,225 @@ KING_MIDDLE_GAME = [
     [60,  70,  50,  20,  20,  50,  70,  60]
 ]
 
+KING_END_GAME = [
+    [-50, -30, -30, -30, -30, -30, -30, -50],
+    [-30, -10,   0,   0,   0,   0, -10, -30],
+    [-30,   0,  20,  30,  30,  20,   0, -30],
+    [-30,   0,  30,  40,  40,  30,   0, -30],  # Active king in the endgame
+    [-30,   0,  30,  40,  40,  30,   0, -30],
+    [-30,   0,  20,  30,  30,  20,   0, -30],
+    [-30, -10,   0,   0,   0,   0, -10, -30],
+    [-50, -30, -30, -30, -30, -30, -30, -50]
+]
+
+MIDDLE_GAME_TABLES = {
+    chess.PAWN: PAWN_TABLE, chess.KNIGHT: KNIGHT_TABLE, chess.BISHOP: BISHOP_TABLE,
+    chess.ROOK: ROOK_TABLE, chess.QUEEN: QUEEN_TABLE, chess.KING: KING_MIDDLE_GAME
+}
+END_GAME_TABLES = dict(MIDDLE_GAME_TABLES)
+END_GAME_TABLES[chess.KING] = KING_END_GAME
+
+# Game phase: 24 with all minor and major pieces on the board, 0 with none
+PHASE_WEIGHTS = [0, 0, 1, 1, 2, 4, 0]  # Indexed by piece type
+MAX_PHASE = 24
+
+def build_piece_square_tables(tables):
+    """Flat 64-entry tables (piece value included) indexed [color][piece_type][square]"""
+    flat = [[None] * 7, [None] * 7]
+    for color in chess.COLORS:
+        for piece_type, table in tables.items():
+            flat[color][piece_type] = [
+                PIECE_VALUES[piece_type] + table[7 - chess.square_rank(square) if color == chess.BLACK
+                                                 else chess.square_rank(square)][chess.square_file(square)]
+                for square in chess.SQUARES]
+    return flat
+
+PST_MIDDLE_GAME = build_piece_square_tables(MIDDLE_GAME_TABLES)
+PST_END_GAME = build_piece_square_tables(END_GAME_TABLES)
+
 def get_piece_square_value(piece, square, endgame=False):
     """Enhanced positional evaluation"""
     if not piece:
         return 0
-    
-    rank = chess.square_rank(square)
-    file = chess.square_file(square)
-    
-    # Flip for black pieces
-    if piece.color == chess.BLACK:
-        rank = 7 - rank
-    
-    base_value = 0
-    if piece.piece_type == chess.PAWN:
-        base_value = PAWN_TABLE[rank][file]
-    elif piece.piece_type == chess.KNIGHT:
-        base_value = KNIGHT_TABLE[rank][file]
-    elif piece.piece_type == chess.BISHOP:
-        base_value = BISHOP_TABLE[rank][file]
-    elif piece.piece_type == chess.ROOK:
-        base_value = ROOK_TABLE[rank][file]
-    elif piece.piece_type == chess.QUEEN:
-        base_value = QUEEN_TABLE[rank][file]
-    elif piece.piece_type == chess.KING:
-        base_value = KING_MIDDLE_GAME[rank][file]
-    
-    return base_value
+    tables = PST_END_GAME if endgame else PST_MIDDLE_GAME
+    return tables[piece.color][piece.piece_type][square] - PIECE_VALUES[piece.piece_type]
+
+def scan_material(board):
+    """Material + piece-square totals from scratch - SearchBoard keeps them incrementally"""
+    middlegame, endgame, phase = [0, 0], [0, 0], 0
+    for color in chess.COLORS:
+        for piece_type in chess.PIECE_TYPES:
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                middlegame[color] += PST_MIDDLE_GAME[color][piece_type][square]
+                endgame[color] += PST_END_GAME[color][piece_type][square]
+                phase += PHASE_WEIGHTS[piece_type]
+    return middlegame, endgame, phase
+
+def tapered_material(board):
+    """(white, black) material + piece-square totals blended by game phase - O(1) on a SearchBoard"""
+    middlegame, endgame, phase = board.material() if isinstance(board, SearchBoard) else scan_material(board)
+    phase = min(phase, MAX_PHASE)  # Promotions can push it past the start position
+    return tuple((middlegame[color] * phase + endgame[color] * (MAX_PHASE - phase)) / MAX_PHASE
+                 for color in (chess.WHITE, chess.BLACK))
 
 def is_endgame(board):
     """Enhanced endgame detection"""
-    material_count = 0
-    queens = 0
-    minor_pieces = 0
-    
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type != chess.KING:
-            material_count += PIECE_VALUES.get(piece.piece_type, 0)
-            if piece.piece_type == chess.QUEEN:
-                queens += 1
-            elif piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-                minor_pieces += 1
+    material_count = (chess.popcount(board.pawns) * PIECE_VALUES[chess.PAWN] +
+                      chess.popcount(board.knights) * PIECE_VALUES[chess.KNIGHT] +
+                      chess.popcount(board.bishops) * PIECE_VALUES[chess.BISHOP] +
+                      chess.popcount(board.rooks) * PIECE_VALUES[chess.ROOK] +
+                      chess.popcount(board.queens) * PIECE_VALUES[chess.QUEEN])
+    queens = chess.popcount(board.queens)
+    minor_pieces = chess.popcount(board.knights | board.bishops)
     
     return material_count < 2500 or queens == 0 or minor_pieces <= 2
 
-def count_attackers_defenders(board, square, attacking_color):
-    """Advanced attacker/defender analysis"""
-    attackers = []
-    attacker_values = []
+def is_pawn_endgame(board, color):
+    """Only king and pawns left for this side - null move is unsafe (zugzwang)"""
+    return not (board.occupied_co[color] & ~board.pawns & ~board.kings)
+
+def attackers_through(board, square, occupied):
+    """Both colours' attackers of a square on a given occupancy - removing a capturer reveals x-rays"""
+    rooks = (board.rooks | board.queens) & (
+        chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] |
+        chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+    bishops = (board.bishops | board.queens) & chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+    pawns = board.pawns & (
+        (chess.BB_PAWN_ATTACKS[chess.WHITE][square] & board.occupied_co[chess.BLACK]) |
+        (chess.BB_PAWN_ATTACKS[chess.BLACK][square] & board.occupied_co[chess.WHITE]))
+    leapers = (chess.BB_KNIGHT_ATTACKS[square] & board.knights) | (chess.BB_KING_ATTACKS[square] & board.kings)
+    return (rooks | bishops | pawns | leapers) & occupied
+
+def static_exchange(board, move):
+    """Static Exchange Evaluation - material the mover nets from the capture sequence
+    on move.to_square, both sides recapturing with their least valuable piece"""
+    target = move.to_square
+    occupied = board.occupied ^ chess.BB_SQUARES[move.from_square]
+    
+    if board.is_en_passant(move):
+        captured = chess.square(chess.square_file(target), chess.square_rank(move.from_square))
+        occupied ^= chess.BB_SQUARES[captured]
+        gain = [SEE_VALUES[chess.PAWN]]
+    else:
+        gain = [SEE_VALUES[board.piece_type_at(target) or 0]]
+    
+    on_square = board.piece_type_at(move.from_square)
+    if move.promotion:
+        gain[0] += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+        on_square = move.promotion
+    
+    side = not board.turn
+    attackers = attackers_through(board, target, occupied)
     
-    for sq in chess.SQUARES:
-        piece = board.piece_at(sq)
-        if piece and piece.color == attacking_color:
-            if square in board.attacks(sq):
-                attackers.append(sq)
-                attacker_values.append(PIECE_VALUES.get(piece.piece_type, 0))
+    while True:
+        side_attackers = attackers & board.occupied_co[side]
+        if not side_attackers:
+            break
+        for piece_type in chess.PIECE_TYPES:  # Pawn up to king
+            candidates = side_attackers & board.pieces_mask(piece_type, side)
+            if candidates:
+                break
+        
+        # Net gain for this side if the sequence ended with its recapture
+        gain.append(SEE_VALUES[on_square] - gain[-1])
+        on_square = piece_type
+        occupied ^= candidates & -candidates
+        attackers = attackers_through(board, target, occupied)
+        side = not side
+    
+    # Each side may stand pat instead of recapturing
+    for i in range(len(gain) - 1, 0, -1):
+        gain[i - 1] = -max(-gain[i - 1], gain[i])
+    return gain[0]
+
+def slider_attacks(piece_type, square, occupied):
+    """Attack mask of a bishop, rook or queen on square for the given occupancy"""
+    attacks = 0
+    if piece_type in (chess.ROOK, chess.QUEEN):
+        attacks |= (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] |
+                    chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+    if piece_type in (chess.BISHOP, chess.QUEEN):
+        attacks |= chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+    return attacks
+
+def gives_check_fast(board, move):
+    """Direct or discovered check from attack masks - no push/pop"""
+    king = board.king(not board.turn)
+    if king is None:
+        return False
+    if board.is_castling(move):
+        return board.gives_check(move)  # Rare enough for the slow path
+    
+    occupied = (board.occupied & ~chess.BB_SQUARES[move.from_square]) | chess.BB_SQUARES[move.to_square]
+    if board.is_en_passant(move):
+        occupied &= ~chess.BB_SQUARES[chess.square(chess.square_file(move.to_square),
+                                                   chess.square_rank(move.from_square))]
+    
+    # Direct check by the moved (or promoted) piece
+    piece_type = move.promotion or board.piece_type_at(move.from_square)
+    if piece_type == chess.PAWN:
+        direct = chess.BB_PAWN_ATTACKS[board.turn][move.to_square]
+    elif piece_type == chess.KNIGHT:
+        direct = chess.BB_KNIGHT_ATTACKS[move.to_square]
+    elif piece_type == chess.KING:
+        direct = 0
+    else:
+        direct = slider_attacks(piece_type, move.to_square, occupied)
+    if direct & chess.BB_SQUARES[king]:
+        return True
+    
+    # Discovered check - one of our other sliders now sees the king
+    sliders = board.occupied_co[board.turn] & ~chess.BB_SQUARES[move.from_square]
+    rooks = sliders & (board.rooks | board.queens)
+    bishops = sliders & (board.bishops | board.queens)
+    return bool((rooks & slider_attacks(chess.ROOK, king, occupied)) or
+                (bishops & slider_attacks(chess.BISHOP, king, occupied)))
+
+class AttackMap:
+    """Every piece's attacks on one position, built once per evaluation and shared by all terms.
+    piece_attacks[square] - attack mask of the piece standing there
+    attackers[color][square] - bitboard of that color's pieces attacking the square
+    attack_counts[color][piece_type] - squares attacked by that color's pieces of that type
+    attacked[color] - every square that color attacks"""
+    __slots__ = ('board', 'piece_attacks', 'attackers', 'attack_counts', 'attacked')
+    
+    def __init__(self, board):
+        self.board = board
+        self.piece_attacks = {}
+        self.attackers = [[0] * 64, [0] * 64]
+        self.attack_counts = [[0] * 7, [0] * 7]
+        self.attacked = [0, 0]
+        
+        white = board.occupied_co[chess.WHITE]
+        for square in chess.scan_forward(board.occupied):
+            attacks = board.attacks_mask(square)
+            self.piece_attacks[square] = attacks
+            color = chess.WHITE if white & chess.BB_SQUARES[square] else chess.BLACK
+            self.attack_counts[color][board.piece_type_at(square)] += chess.popcount(attacks)
+            self.attacked[color] |= attacks
+            
+            bit = chess.BB_SQUARES[square]
+            color_attackers = self.attackers[color]
+            for target in chess.scan_forward(attacks):
+                color_attackers[target] |= bit
     
-    return len(attackers), attacker_values, attackers
+    def attacker_count(self, square, color):
+        return chess.popcount(self.attackers[color][square])
+
+# Danger-zone penalty per attacking piece type (pawn..king)
+KING_ZONE_PENALTIES = [0, 30, 60, 50, 80, 120, 0]
 
-def evaluate_king_safety(board, color):
+def evaluate_king_safety(board, color, attack_map=None, pawn_entry=None):
     """BRUTAL king safety evaluation"""
     king_square = board.king(color)
     if not king_square:
         return 0
     
+    if attack_map is None:
+        attack_map = AttackMap(board)
     safety_score = 0
     enemy_color = not color
+    enemy_attackers = attack_map.attackers[enemy_color]
     
     # Extended danger zone (5x5 area around king)
     danger_squares = []
@@ -389,51 +1072,69 @@ def evaluate_king_safety(board, color):
                 distance = max(abs(rank_offset), abs(file_offset))
                 weight = 3.0 - distance * 0.5
                 
-                attacker_count, attacker_values, _ = count_attackers_defenders(board, danger_square, enemy_color)
-                
-                for attacker_value in attacker_values:
-                    if attacker_value >= PIECE_VALUES[chess.QUEEN]:
-                        safety_score -= 120 * weight  # Queen attacks are devastating
-                    elif attacker_value >= PIECE_VALUES[chess.ROOK]:
-                        safety_score -= 80 * weight
-                    elif attacker_value >= PIECE_VALUES[chess.BISHOP]:
-                        safety_score -= 50 * weight
-                    elif attacker_value >= PIECE_VALUES[chess.KNIGHT]:
-                        safety_score -= 60 * weight  # Knights are dangerous
-                    elif attacker_value >= PIECE_VALUES[chess.PAWN]:
-                        safety_score -= 30 * weight
-    
-    # Pawn shield evaluation (enhanced)
-    pawn_shield_bonus = 0
-    shield_ranks = [1, 2] if color == chess.WHITE else [6, 5]
-    
-    for rank in shield_ranks:
-        for file_offset in [-1, 0, 1]:
-            shield_file = king_file + file_offset
-            if 0 <= shield_file <= 7:
-                shield_square = chess.square(shield_file, rank)
-                piece = board.piece_at(shield_square)
-                if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                    pawn_shield_bonus += 35 if rank == shield_ranks[0] else 20
+                # Queen attacks are devastating, knights are dangerous
+                for attacker in chess.scan_forward(enemy_attackers[danger_square]):
+                    penalty = KING_ZONE_PENALTIES[board.piece_type_at(attacker)]
+                    if penalty:
+                        safety_score -= penalty * weight
+    
+    # Pawn shield and open files - pawn placement only, so normally from the pawn hash
+    if pawn_entry:
+        return safety_score + pawn_entry[2][color][king_file]
+    return safety_score + king_shelter(board, color, king_file)
+
+def king_shelter(board, color, king_file):
+    """Pawn shield bonus plus open-file penalty for a king on king_file"""
+    own_pawns = board.pawns & board.occupied_co[color]
+    near_files = adjacent_files_mask(chess.square(king_file, 0))
+    front, behind = (chess.BB_RANK_2, chess.BB_RANK_3) if color == chess.WHITE else (chess.BB_RANK_7, chess.BB_RANK_6)
+    pawn_shield_bonus = 35 * chess.popcount(own_pawns & near_files & front) + 20 * chess.popcount(own_pawns & near_files & behind)
     
     # Open files near king penalty
-    open_file_penalty = 0
-    for file_offset in [-1, 0, 1]:
-        check_file = king_file + file_offset
-        if 0 <= check_file <= 7:
-            has_pawn = False
-            for rank in range(8):
-                square = chess.square(check_file, rank)
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
-                    has_pawn = True
-                    break
-            if not has_pawn:
-                open_file_penalty -= 40
-    
-    return safety_score + pawn_shield_bonus + open_file_penalty
+    open_files = sum(1 for file in range(max(0, king_file - 1), min(7, king_file + 1) + 1)
+                     if not board.pawns & chess.BB_FILES[file])
+    return pawn_shield_bonus - 40 * open_files
+
+# Bitboard masks for the evaluation terms
+# DISTANCE_RINGS[square][d] - squares exactly d king steps away
+DISTANCE_RINGS = [[0] * 8 for _ in chess.SQUARES]
+for _square in chess.SQUARES:
+    for _other in chess.SQUARES:
+        DISTANCE_RINGS[_square][chess.square_distance(_square, _other)] |= chess.BB_SQUARES[_other]
+
+def adjacent_files_mask(square):
+    file = chess.square_file(square)
+    return chess.BB_FILES[file] | (chess.BB_FILES[file - 1] if file > 0 else 0) | (chess.BB_FILES[file + 1] if file < 7 else 0)
 
-def evaluate_tactical_motifs(board, aggression_factor):
+def ranks_mask(ranks):
+    mask = 0
+    for rank in ranks:
+        mask |= chess.BB_RANKS[rank]
+    return mask
+
+# Enemy pawns on these squares stop a pawn from being passed (own file and neighbours, ahead of it)
+WHITE_PASSED_MASKS = [adjacent_files_mask(sq) & ranks_mask(range(chess.square_rank(sq) + 1, 8)) for sq in chess.SQUARES]
+BLACK_PASSED_MASKS = [adjacent_files_mask(sq) & ranks_mask(range(chess.square_rank(sq))) for sq in chess.SQUARES]
+# Black passed pawn supporters: the squares 7 and 9 below (no file wrap check, as always scored)
+BLACK_SUPPORT_MASKS = [sum(chess.BB_SQUARES[sq - offset] for offset in (9, 7) if sq - offset >= 0) for sq in chess.SQUARES]
+
+# Per piece type (pawn..king): bonus for hitting squares near the human king, mobility weights
+KING_ATTACK_BONUS = [0, 25, 55, 45, 70, 100, 0]
+BLACK_MOBILITY_WEIGHTS = [0, 3, 5, 4, 6, 8, 0]
+WHITE_MOBILITY_WEIGHTS = [0, 2, 3, 2, 3, 4, 0]
+
+def file_occupancy(bb):
+    """8-bit mask of the files holding at least one piece of bb"""
+    bb |= bb >> 32
+    bb |= bb >> 16
+    bb |= bb >> 8
+    return bb & 0xFF
+
+def count_pawn_islands(pawns):
+    files = file_occupancy(pawns)
+    return chess.popcount(files & ~(files << 1))  # Files starting a run of pawn files
+
+def evaluate_tactical_motifs(board, aggression_factor, attack_map=None):
     """INSANE tactical pattern recognition"""
     score = 0
     
@@ -443,286 +1144,376 @@ def evaluate_tactical_motifs(board, aggression_factor):
     if not white_king or not black_king:
         return score
     
+    if attack_map is None:
+        attack_map = AttackMap(board)
+    piece_attacks = attack_map.piece_attacks
+    white = board.occupied_co[chess.WHITE]
+    near_white_king = DISTANCE_RINGS[white_king]
+    
     # BRUTAL attack patterns
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.color == chess.BLACK:  # AI pieces
-            attacks = list(board.attacks(square))
-            
-            for attack_square in attacks:
-                target_piece = board.piece_at(attack_square)
-                distance_to_white_king = chess.square_distance(attack_square, white_king)
-                
-                # Massive bonus for attacking near human king
-                if distance_to_white_king <= 3:
-                    base_bonus = 0
-                    if piece.piece_type == chess.QUEEN:
-                        base_bonus = 100
-                    elif piece.piece_type == chess.ROOK:
-                        base_bonus = 70
-                    elif piece.piece_type == chess.BISHOP:
-                        base_bonus = 45
-                    elif piece.piece_type == chess.KNIGHT:
-                        base_bonus = 55
-                    elif piece.piece_type == chess.PAWN:
-                        base_bonus = 25
-                    
-                    # Distance multiplier
-                    distance_multiplier = 4.0 - distance_to_white_king
-                    score += base_bonus * distance_multiplier * aggression_factor
-                
-                # Bonus for attacking valuable pieces
-                if target_piece and target_piece.color == chess.WHITE:
-                    target_value = PIECE_VALUES.get(target_piece.piece_type, 0)
-                    attacker_value = PIECE_VALUES.get(piece.piece_type, 0)
-                    
-                    if target_value > attacker_value:
-                        score += (target_value - attacker_value) * 0.8 * aggression_factor
-                    elif target_value >= attacker_value:
-                        score += target_value * 0.3 * aggression_factor
+    for square in chess.scan_forward(board.occupied_co[chess.BLACK]):  # AI pieces
+        piece_type = board.piece_type_at(square)
+        attacks = piece_attacks[square]
+        
+        # Massive bonus for attacking near human king, scaled by distance
+        base_bonus = KING_ATTACK_BONUS[piece_type]
+        if base_bonus:
+            for distance in range(4):
+                hits = chess.popcount(attacks & near_white_king[distance])
+                if hits:
+                    score += base_bonus * (4.0 - distance) * aggression_factor * hits
+        
+        # Bonus for attacking valuable pieces
+        attacker_value = PIECE_VALUES[piece_type]
+        targets = attacks & white
+        while targets:
+            target_value = PIECE_VALUES[board.piece_type_at(chess.lsb(targets))]
+            targets &= targets - 1
+            if target_value > attacker_value:
+                score += (target_value - attacker_value) * 0.8 * aggression_factor
+            elif target_value >= attacker_value:
+                score += target_value * 0.3 * aggression_factor
     
     # Penalty for human attacking AI king (but less severe - encourage aggression)
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.color == chess.WHITE:
-            attacks = list(board.attacks(square))
-            
-            for attack_square in attacks:
-                distance_to_black_king = chess.square_distance(attack_square, black_king)
-                if distance_to_black_king <= 2:
-                    score -= 25  # Reduced penalty to encourage AI risk-taking
+    near_black_king = DISTANCE_RINGS[black_king][0] | DISTANCE_RINGS[black_king][1] | DISTANCE_RINGS[black_king][2]
+    for square in chess.scan_forward(white):
+        score -= 25 * chess.popcount(piece_attacks[square] & near_black_king)  # Reduced penalty to encourage AI risk-taking
     
     return score
 
+# Pawn hash - pawn structure score and king shelter per king file, keyed by the pawns alone
+PAWN_HASH_SIZE = 1 << 14  # Entries (power of two)
+pawn_hash = [None] * PAWN_HASH_SIZE
+pawn_hash_stats = {'hits': 0, 'misses': 0}
+
+def pawn_hash_clear():
+    pawn_hash[:] = [None] * PAWN_HASH_SIZE
+    pawn_hash_stats.update(hits=0, misses=0)
+
+def pawn_hash_hit_rate():
+    probes = pawn_hash_stats['hits'] + pawn_hash_stats['misses']
+    return 100.0 * pawn_hash_stats['hits'] / probes if probes else 0.0
+
+def probe_pawn_hash(board, aggression_factor):
+    """(key, pawn structure score, shelter[color][king_file]) - computed only on a miss"""
+    pawn_key = board.pawn_key() if isinstance(board, SearchBoard) else scan_pawn_key(board)
+    key = pawn_key ^ eval_salt(aggression_factor, 0)
+    index = key & (PAWN_HASH_SIZE - 1)
+    entry = pawn_hash[index]
+    if entry and entry[0] == key:
+        pawn_hash_stats['hits'] += 1
+        return entry
+    
+    pawn_hash_stats['misses'] += 1
+    shelter = [[king_shelter(board, color, file) for file in range(8)] for color in (chess.BLACK, chess.WHITE)]
+    entry = (key, evaluate_pawn_structure(board, aggression_factor), shelter)
+    pawn_hash[index] = entry
+    return entry
+
 def evaluate_pawn_structure(board, aggression_factor):
     """Advanced pawn structure evaluation"""
     score = 0
     
-    white_pawns = []
-    black_pawns = []
-    
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.PAWN:
-            if piece.color == chess.WHITE:
-                white_pawns.append(square)
-            else:
-                black_pawns.append(square)
+    white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+    black_pawns = board.pawns & board.occupied_co[chess.BLACK]
     
     # AI passed pawns get MASSIVE bonus
-    for pawn_square in black_pawns:
-        file = chess.square_file(pawn_square)
-        rank = chess.square_rank(pawn_square)
-        
-        is_passed = True
-        for enemy_pawn in white_pawns:
-            enemy_file = chess.square_file(enemy_pawn)
-            enemy_rank = chess.square_rank(enemy_pawn)
-            
-            if abs(enemy_file - file) <= 1 and enemy_rank < rank:
-                is_passed = False
-                break
-        
-        if is_passed:
+    for pawn_square in chess.scan_forward(black_pawns):
+        if not BLACK_PASSED_MASKS[pawn_square] & white_pawns:
             # Exponential bonus for advanced passed pawns
-            advancement = rank + 1
-            bonus = advancement * advancement * 20 * aggression_factor
-            score += bonus
+            advancement = chess.square_rank(pawn_square) + 1
+            score += advancement * advancement * 20 * aggression_factor
             
             # Extra bonus if supported
-            support_squares = [pawn_square - 9, pawn_square - 7]
-            for support_sq in support_squares:
-                if 0 <= support_sq <= 63:
-                    support_piece = board.piece_at(support_sq)
-                    if (support_piece and support_piece.piece_type == chess.PAWN 
-                        and support_piece.color == chess.BLACK):
-                        score += 30 * aggression_factor
+            for _ in range(chess.popcount(BLACK_SUPPORT_MASKS[pawn_square] & black_pawns)):
+                score += 30 * aggression_factor
     
     # Human passed pawns get reduced penalty (AI takes risks)
-    for pawn_square in white_pawns:
-        file = chess.square_file(pawn_square)
-        rank = chess.square_rank(pawn_square)
-        
-        is_passed = True
-        for enemy_pawn in black_pawns:
-            enemy_file = chess.square_file(enemy_pawn)
-            enemy_rank = chess.square_rank(enemy_pawn)
-            
-            if abs(enemy_file - file) <= 1 and enemy_rank > rank:
-                is_passed = False
-                break
-        
-        if is_passed:
-            advancement = 6 - rank
-            penalty = advancement * 18  # Reduced penalty
-            score -= penalty
-    
-    # Pawn chains and islands
-    files_with_pawns = {'white': set(), 'black': set()}
-    for pawn_square in white_pawns:
-        files_with_pawns['white'].add(chess.square_file(pawn_square))
-    for pawn_square in black_pawns:
-        files_with_pawns['black'].add(chess.square_file(pawn_square))
+    for pawn_square in chess.scan_forward(white_pawns):
+        if not WHITE_PASSED_MASKS[pawn_square] & black_pawns:
+            advancement = 6 - chess.square_rank(pawn_square)
+            score -= advancement * 18  # Reduced penalty
     
     # Penalty for pawn islands (AI prefers connected pawns)
-    def count_pawn_islands(files):
-        if not files:
-            return 0
-        sorted_files = sorted(files)
-        islands = 1
-        for i in range(1, len(sorted_files)):
-            if sorted_files[i] - sorted_files[i-1] > 1:
-                islands += 1
-        return islands
+    score += (count_pawn_islands(white_pawns) - count_pawn_islands(black_pawns)) * 25
     
-    white_islands = count_pawn_islands(files_with_pawns['white'])
-    black_islands = count_pawn_islands(files_with_pawns['black'])
+    return score
+
+def pawn_pushes(board, pawns, color):
+    """Single and double push destinations of the given pawns"""
+    empty = ~board.occupied & chess.BB_ALL
+    if color == chess.WHITE:
+        single = (pawns << 8) & empty
+        return single | ((single & chess.BB_RANK_3) << 8) & empty
+    single = (pawns >> 8) & empty
+    return single | ((single & chess.BB_RANK_6) >> 8) & empty
+
+def piece_destinations(board, square, piece_type, color, attack_map):
+    """Pseudo-legal destinations of one piece - the king avoids attacked squares"""
+    own = board.occupied_co[color]
+    attacks = attack_map.piece_attacks[square]
+    if piece_type == chess.PAWN:
+        return (attacks & board.occupied_co[not color]) | pawn_pushes(board, chess.BB_SQUARES[square], color)
+    if piece_type == chess.KING:
+        return attacks & ~own & ~attack_map.attacked[not color]
+    return attacks & ~own
+
+def count_mobility(board, color, attack_map):
+    """(moves, captures) counted from attack masks instead of legal move generation.
+    Promotions count four times, castling and pins are ignored"""
+    enemy = board.occupied_co[not color]
+    moves = captures = 0
+    for square in chess.scan_forward(board.occupied_co[color] & ~board.pawns):
+        destinations = piece_destinations(board, square, board.piece_type_at(square), color, attack_map)
+        moves += chess.popcount(destinations)
+        captures += chess.popcount(destinations & enemy)
+    
+    pawns = board.pawns & board.occupied_co[color]
+    pawn_captures = 0
+    for square in chess.scan_forward(pawns):
+        pawn_captures += chess.popcount(attack_map.piece_attacks[square] & enemy)
+    pushes = pawn_pushes(board, pawns, color)
+    promotions = chess.popcount(pushes & chess.BB_BACKRANKS)
+    moves += chess.popcount(pushes) + pawn_captures + 3 * promotions
+    captures += pawn_captures
+    return moves, captures
+
+def attacks_from(piece_type, color, square, occupied):
+    """Attack mask a piece would have on square"""
+    if piece_type == chess.PAWN:
+        return chess.BB_PAWN_ATTACKS[color][square]
+    if piece_type == chess.KNIGHT:
+        return chess.BB_KNIGHT_ATTACKS[square]
+    if piece_type == chess.KING:
+        return chess.BB_KING_ATTACKS[square]
+    return slider_attacks(piece_type, square, occupied)
+
+def evaluate_attacking_moves(board, aggression_factor, attack_map):
+    """Checks and forks among the AI's moves, found with attack tables instead of push/pop.
+    A move checks when it lands on a square the piece would attack the human king from,
+    and forks when the piece hits two or more human knights or bigger from there"""
+    white_king = board.king(chess.WHITE)
+    if white_king is None:
+        return 0
+    
+    score = 0
+    valuable_targets = board.occupied_co[chess.WHITE] & ~board.pawns & ~board.kings
+    if board.is_check():
+        # Only the few evasions count here
+        for move in board.generate_legal_moves():
+            if gives_check_fast(board, move):
+                score += 150 * aggression_factor
+            piece_type = move.promotion or board.piece_type_at(move.from_square)
+            occupied = (board.occupied & ~chess.BB_SQUARES[move.from_square]) | chess.BB_SQUARES[move.to_square]
+            targets = valuable_targets & ~chess.BB_SQUARES[move.to_square]
+            if chess.popcount(attacks_from(piece_type, chess.BLACK, move.to_square, occupied) & targets) >= 2:
+                score += 80 * aggression_factor
+        return score
     
-    score += (white_islands - black_islands) * 25
+    for square in chess.scan_forward(board.occupied_co[chess.BLACK]):
+        piece_type = board.piece_type_at(square)
+        destinations = piece_destinations(board, square, piece_type, chess.BLACK, attack_map)
+        occupied = board.occupied & ~chess.BB_SQUARES[square]
+        
+        # Checking squares: where this piece type would attack the king (reverse lookup from it)
+        if piece_type != chess.KING:
+            checking_squares = attacks_from(piece_type, chess.WHITE, white_king, occupied)
+            score += 150 * aggression_factor * chess.popcount(destinations & checking_squares)
+        
+        # Potential forks
+        for destination in chess.scan_forward(destinations):
+            if chess.popcount(attacks_from(piece_type, chess.BLACK, destination, occupied) & valuable_targets) >= 2:
+                score += 80 * aggression_factor
     
     return score
 
-def evaluate_piece_activity(board, aggression_factor):
+def evaluate_piece_activity(board, aggression_factor, attack_map=None):
     """Reward hyperactive pieces"""
-    score = 0
+    if attack_map is None:
+        attack_map = AttackMap(board)
+    black_counts = attack_map.attack_counts[chess.BLACK]
+    white_counts = attack_map.attack_counts[chess.WHITE]
     
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            try:
-                attacks = list(board.attacks(square))
-                mobility = len(attacks)
-                
-                # Base mobility bonus
-                if piece.color == chess.BLACK:  # AI pieces
-                    if piece.piece_type == chess.QUEEN:
-                        score += mobility * 8 * aggression_factor
-                    elif piece.piece_type == chess.ROOK:
-                        score += mobility * 6 * aggression_factor
-                    elif piece.piece_type == chess.BISHOP:
-                        score += mobility * 4 * aggression_factor
-                    elif piece.piece_type == chess.KNIGHT:
-                        score += mobility * 5 * aggression_factor  # Knights love mobility
-                    elif piece.piece_type == chess.PAWN:
-                        score += mobility * 3 * aggression_factor
-                else:  # Human pieces (reduce their mobility value)
-                    if piece.piece_type == chess.QUEEN:
-                        score -= mobility * 4
-                    elif piece.piece_type == chess.ROOK:
-                        score -= mobility * 3
-                    elif piece.piece_type == chess.BISHOP:
-                        score -= mobility * 2
-                    elif piece.piece_type == chess.KNIGHT:
-                        score -= mobility * 3
-                    elif piece.piece_type == chess.PAWN:
-                        score -= mobility * 2
-            except:
-                pass
+    # Base mobility bonus per piece type - AI pieces count extra, human mobility is worth less
+    score = 0
+    for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN):
+        score += black_counts[piece_type] * BLACK_MOBILITY_WEIGHTS[piece_type] * aggression_factor
+        score -= white_counts[piece_type] * WHITE_MOBILITY_WEIGHTS[piece_type]
     
     return score
 
+# Evaluation cache - fixed size, clusters of EVAL_CACHE_WAYS entries kept in LRU order.
+# Keys and scores live in separate arrays, so only the search thread may touch it -
+# the GUI evaluation bar calls compute_evaluation directly
+EVAL_CACHE_SIZE = 1 << 16  # Entries (power of two) - 1 MB of keys and scores
+EVAL_CACHE_WAYS = 4
+eval_cache_keys = array.array('Q', [0]) * EVAL_CACHE_SIZE
+eval_cache_scores = array.array('q', [0]) * EVAL_CACHE_SIZE
+eval_cache_stats = {'hits': 0, 'misses': 0}
+
+def eval_cache_clear():
+    eval_cache_keys[:] = array.array('Q', [0]) * EVAL_CACHE_SIZE
+    eval_cache_stats.update(hits=0, misses=0)
+
+def eval_cache_hit_rate():
+    probes = eval_cache_stats['hits'] + eval_cache_stats['misses']
+    return 100.0 * eval_cache_stats['hits'] / probes if probes else 0.0
+
+def eval_cache_lookup(key):
+    """Cached score or None - a hit moves to the front of its cluster"""
+    base = key & (EVAL_CACHE_SIZE - EVAL_CACHE_WAYS)
+    for slot in range(base, base + EVAL_CACHE_WAYS):
+        if eval_cache_keys[slot] == key:
+            score = eval_cache_scores[slot]
+            if slot != base:
+                eval_cache_insert(base, slot, key, score)
+            eval_cache_stats['hits'] += 1
+            return score
+    eval_cache_stats['misses'] += 1
+    return None
+
+def eval_cache_insert(base, last, key, score):
+    """Put key at the front of the cluster, shifting entries base..last-1 back by one"""
+    eval_cache_keys[base + 1:last + 1] = eval_cache_keys[base:last]
+    eval_cache_scores[base + 1:last + 1] = eval_cache_scores[base:last]
+    eval_cache_keys[base] = key
+    eval_cache_scores[base] = score
+
 def evaluate_board(board, aggression_factor=1.0, tactical_bonus=1.0):
-    """INSANELY AGGRESSIVE board evaluation - UNBEATABLE AI"""
-    if board.is_checkmate():
-        return -100000 if board.turn == chess.WHITE else 100000
+    """INSANELY AGGRESSIVE board evaluation - UNBEATABLE AI (cached per position and setting)"""
+    key = (position_key(board) ^ eval_salt(aggression_factor, tactical_bonus)) or 1
+    score = eval_cache_lookup(key)
+    if score is None:
+        score = compute_evaluation(board, aggression_factor, tactical_bonus)
+        # Least recently used entry of the cluster falls out
+        base = key & (EVAL_CACHE_SIZE - EVAL_CACHE_WAYS)
+        eval_cache_insert(base, base + EVAL_CACHE_WAYS - 1, key, score)
+    return score
+
+# Lazy evaluation - (below, above) swing the unevaluated tiers can still add: the worst
+# full eval minus partial score bench.py lazy saw over ~73000 positions, not a proven bound.
+# Tier 2 scales with aggression, tier 3 with aggression * tactical bonus;
+# the AI-favouring terms push scores up far more than down. Off until a bench shows a gain -
+# with margins this wide almost nothing exits early
+LAZY_EVAL = False
+LAZY_EVAL_MARGINS = [None, (2200, 58450), (500, 8650)]
+lazy_eval_stats = [0, 0, 0, 0]  # Evaluations reaching tier 1, 2, 3
+
+def lazy_eval_report():
+    """Share of lazy evaluations that stop after tier 1, after tier 2, or run in full"""
+    reached = lazy_eval_stats[1]
+    if not reached:
+        return "no lazy evals"
+    exits = (lazy_eval_stats[1] - lazy_eval_stats[2], lazy_eval_stats[2] - lazy_eval_stats[3], lazy_eval_stats[3])
+    return " / ".join(f"{name} {100.0 * count / reached:.0f}%" for name, count in zip(("T1", "T2", "full"), exits))
+
+def lazy_bound(score, endgame, margin, low, high):
+    """Bound to return when the remaining tiers can't bring score into (low, high), else None"""
+    below, above = margin
+    if endgame:
+        score *= 1.3
+    # Never a bound in mate territory - it would read as a forced mate
+    if score + above <= low and score + above > -MATE_THRESHOLD:
+        return int(score + above)
+    if score - below >= high and score - below < MATE_THRESHOLD:
+        return int(score - below)
+    return None
+
+def lazy_evaluate(board, aggression_factor, tactical_bonus, low, high):
+    """evaluate_board in tiers, stopping once the score is certainly outside (low, high).
+    A bound outside the window comes back instead of the exact score, and isn't cached"""
+    key = (position_key(board) ^ eval_salt(aggression_factor, tactical_bonus)) or 1
+    score = eval_cache_lookup(key)
+    if score is not None:
+        return score
     
+    if board.is_checkmate():
+        return MATE_SCORE if board.turn == chess.WHITE else -MATE_SCORE
     if board.is_stalemate() or board.is_insufficient_material():
-        return -5000  # AI hates draws
+        return -5000
     
-    score = 0
     endgame = is_endgame(board)
+    lazy_eval_stats[1] += 1
+    score = evaluation_tier1(board)
+    below, above = LAZY_EVAL_MARGINS[1]
+    bound = lazy_bound(score, endgame, (below * aggression_factor, above * aggression_factor), low, high)
+    if bound is not None:
+        return bound
+    
+    lazy_eval_stats[2] += 1
+    attack_map = AttackMap(board)
+    score += evaluation_tier2(board, aggression_factor, attack_map)
+    below, above = LAZY_EVAL_MARGINS[2]
+    scale = aggression_factor * tactical_bonus
+    bound = lazy_bound(score, endgame, (below * scale, above * scale), low, high)
+    if bound is not None:
+        return bound
+    
+    lazy_eval_stats[3] += 1
+    score += evaluation_tier3(board, aggression_factor, tactical_bonus, attack_map)
+    score = finish_evaluation(board, score, endgame)
+    base = key & (EVAL_CACHE_SIZE - EVAL_CACHE_WAYS)
+    eval_cache_insert(base, base + EVAL_CACHE_WAYS - 1, key, score)
+    return score
+
+def compute_evaluation(board, aggression_factor=1.0, tactical_bonus=1.0):
+    """The full evaluation behind evaluate_board's cache"""
+    if board.is_checkmate():
+        return MATE_SCORE if board.turn == chess.WHITE else -MATE_SCORE
     
-    # 1. BRUTAL Material evaluation
-    white_material = 0
-    black_material = 0
-    
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            piece_value = PIECE_VALUES.get(piece.piece_type, 0)
-            position_value = get_piece_square_value(piece, square, endgame)
-            
-            total_value = piece_value + position_value
-            
-            if piece.color == chess.WHITE:
-                white_material += total_value
-            else:
-                black_material += total_value * 1.1  # AI pieces are more valuable
-    
-    score = black_material - white_material
+    if board.is_stalemate() or board.is_insufficient_material():
+        return -5000  # AI hates draws
     
+    endgame = is_endgame(board)
+    score = evaluation_tier1(board)
+    attack_map = AttackMap(board)
+    score += evaluation_tier2(board, aggression_factor, attack_map)
+    score += evaluation_tier3(board, aggression_factor, tactical_bonus, attack_map)
+    return finish_evaluation(board, score, endgame)
+
+def evaluation_tier1(board):
+    """Tier 1 - material and piece-square tables"""
+    # 1. BRUTAL Material evaluation (tapered, kept incrementally during search)
+    white_material, black_material = tapered_material(board)
+    return black_material * 1.1 - white_material  # AI pieces are more valuable
+
+def evaluation_tier2(board, aggression_factor, attack_map):
+    """Tier 2 - pawn structure and king safety"""
     # 2. DEVASTATING King Safety evaluation
-    white_king_safety = evaluate_king_safety(board, chess.WHITE)
-    black_king_safety = evaluate_king_safety(board, chess.BLACK)
+    pawn_entry = probe_pawn_hash(board, aggression_factor)
+    white_king_safety = evaluate_king_safety(board, chess.WHITE, attack_map, pawn_entry)
+    black_king_safety = evaluate_king_safety(board, chess.BLACK, attack_map, pawn_entry)
     
     # AI gets MASSIVE bonus for threatening human king
-    score -= white_king_safety * 4.0 * aggression_factor
+    score = -white_king_safety * 4.0 * aggression_factor
     score += black_king_safety * 1.5  # AI still protects own king
     
+    # 6. AGGRESSIVE pawn structure
+    score += pawn_entry[1]
+    return score
+
+def evaluation_tier3(board, aggression_factor, tactical_bonus, attack_map):
+    """Tier 3 - tactics, mobility, center control and piece activity"""
     # 3. BRUTAL tactical motifs
-    tactical_score = evaluate_tactical_motifs(board, aggression_factor)
-    score += tactical_score * tactical_bonus
+    tactical_score = evaluate_tactical_motifs(board, aggression_factor, attack_map)
+    score = tactical_score * tactical_bonus
     
-    # 4. INSANE mobility advantage
-    original_turn = board.turn
+    # 4. INSANE mobility advantage (pseudo-legal, from the attack map)
+    black_mobility, black_captures = count_mobility(board, chess.BLACK, attack_map)
+    white_mobility, white_captures = count_mobility(board, chess.WHITE, attack_map)
     
-    try:
-        board.turn = chess.WHITE
-        white_moves = list(board.legal_moves)
-        white_mobility = len(white_moves)
-        
-        board.turn = chess.BLACK  
-        black_moves = list(board.legal_moves)
-        black_mobility = len(black_moves)
-        
-        board.turn = original_turn
-        
-        # AI values its mobility WAY more
-        mobility_diff = (black_mobility - white_mobility)
-        score += mobility_diff * 8 * aggression_factor
-        
-        # Bonus for having many aggressive options
-        black_captures = sum(1 for move in black_moves if board.is_capture(move))
-        white_captures = sum(1 for move in white_moves if board.is_capture(move))
-        
-        score += (black_captures - white_captures) * 25 * aggression_factor
-        
-    except:
-        board.turn = original_turn
-    
-    # 5. EXTREME center control
-    center_squares = [chess.E4, chess.E5, chess.D4, chess.D5]
-    extended_center = [chess.C3, chess.C4, chess.C5, chess.C6,
-                      chess.D3, chess.D6, chess.E3, chess.E6,
-                      chess.F3, chess.F4, chess.F5, chess.F6]
-    
-    for square in center_squares:
-        piece = board.piece_at(square)
-        if piece:
-            if piece.color == chess.BLACK:  # AI
-                score += 50 * aggression_factor
-            else:
-                score -= 35
-        
-        # BRUTAL control evaluation
-        black_attackers, _, _ = count_attackers_defenders(board, square, chess.BLACK)
-        white_attackers, _, _ = count_attackers_defenders(board, square, chess.WHITE)
-        control_diff = black_attackers - white_attackers
-        score += control_diff * 15 * aggression_factor
+    # AI values its mobility WAY more
+    mobility_diff = (black_mobility - white_mobility)
+    score += mobility_diff * 8 * aggression_factor
     
-    # Extended center
-    for square in extended_center:
-        black_attackers, _, _ = count_attackers_defenders(board, square, chess.BLACK)
-        white_attackers, _, _ = count_attackers_defenders(board, square, chess.WHITE)
-        control_diff = black_attackers - white_attackers
-        score += control_diff * 6 * aggression_factor
+    # Bonus for having many aggressive options
+    score += (black_captures - white_captures) * 25 * aggression_factor
     
-    # 6. AGGRESSIVE pawn structure
-    pawn_score = evaluate_pawn_structure(board, aggression_factor)
-    score += pawn_score
+    # 5. EXTREME center control
+    score += evaluate_center_control(board, aggression_factor, attack_map)
     
     # 7. HYPERACTIVE piece evaluation
-    activity_score = evaluate_piece_activity(board, aggression_factor)
+    activity_score = evaluate_piece_activity(board, aggression_factor, attack_map)
     score += activity_score
     
     # 8. DEVASTATING check bonus
@@ -733,50 +1524,52 @@ def evaluate_board(board, aggression_factor=1.0, tactical_bonus=1.0):
             score -= 100
     
     # 9. Advanced piece positioning bonuses
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.color == chess.BLACK:
-            rank = chess.square_rank(square)
-            
-            # MASSIVE bonus for pieces advancing towards enemy
-            if piece.piece_type in [chess.KNIGHT, chess.BISHOP, chess.QUEEN]:
-                if rank <= 4:  # Advanced position for black
-                    advancement_bonus = (5 - rank) * 30 * aggression_factor
-                    score += advancement_bonus
-            
-            # Special queen aggression bonus
-            if piece.piece_type == chess.QUEEN and rank <= 3:
-                score += 100 * aggression_factor
+    black_queens = board.queens & board.occupied_co[chess.BLACK]
+    for square in chess.scan_forward((board.knights | board.bishops | board.queens) & board.occupied_co[chess.BLACK]):
+        rank = chess.square_rank(square)
+        
+        # MASSIVE bonus for pieces advancing towards enemy
+        if rank <= 4:  # Advanced position for black
+            advancement_bonus = (5 - rank) * 30 * aggression_factor
+            score += advancement_bonus
+        
+        # Special queen aggression bonus
+        if black_queens & chess.BB_SQUARES[square] and rank <= 3:
+            score += 100 * aggression_factor
     
     # 10. BRUTAL attacking combinations detection
-    try:
-        # Look for discovered attacks
-        for move in board.legal_moves:
-            if board.turn == chess.BLACK:  # AI turn
-                board.push(move)
-                if board.is_check():
-                    score += 150 * aggression_factor  # Discovered check bonus
-                
-                # Look for forks, pins, skewers
-                attacking_piece = board.piece_at(move.to_square)
-                if attacking_piece:
-                    attacks = list(board.attacks(move.to_square))
-                    valuable_targets = 0
-                    for attack_sq in attacks:
-                        target = board.piece_at(attack_sq)
-                        if target and target.color == chess.WHITE:
-                            target_value = PIECE_VALUES.get(target.piece_type, 0)
-                            if target_value >= PIECE_VALUES[chess.KNIGHT]:
-                                valuable_targets += 1
-                    
-                    if valuable_targets >= 2:  # Potential fork
-                        score += 80 * aggression_factor
-                
-                board.pop()
-    except:
-        pass
+    if board.turn == chess.BLACK:  # AI turn
+        score += evaluate_attacking_moves(board, aggression_factor, attack_map)
+    return score
+
+CENTER_SQUARES = [chess.E4, chess.E5, chess.D4, chess.D5]
+EXTENDED_CENTER = [chess.C3, chess.C4, chess.C5, chess.C6,
+                   chess.D3, chess.D6, chess.E3, chess.E6,
+                   chess.F3, chess.F4, chess.F5, chess.F6]
+
+def evaluate_center_control(board, aggression_factor, attack_map):
+    """Center occupation and control"""
+    score = 0
+    for square in CENTER_SQUARES:
+        piece = board.piece_at(square)
+        if piece:
+            if piece.color == chess.BLACK:  # AI
+                score += 50 * aggression_factor
+            else:
+                score -= 35
+        
+        # BRUTAL control evaluation
+        control_diff = attack_map.attacker_count(square, chess.BLACK) - attack_map.attacker_count(square, chess.WHITE)
+        score += control_diff * 15 * aggression_factor
     
-    # 11. Endgame specialization
+    # Extended center
+    for square in EXTENDED_CENTER:
+        control_diff = attack_map.attacker_count(square, chess.BLACK) - attack_map.attacker_count(square, chess.WHITE)
+        score += control_diff * 6 * aggression_factor
+    return score
+
+def finish_evaluation(board, score, endgame):
+    """11. Endgame specialization on top of the tier sum"""
     if endgame:
         # AI becomes even more aggressive in endgame
         score = int(score * 1.3)
@@ -803,33 +1596,151 @@ def evaluate_board(board, aggression_factor=1.0, tactical_bonus=1.0):
     
     return int(score)
 
-def advanced_move_ordering(board, moves, aggression_factor=1.0, depth=0):
+def structure_evaluation(board, aggression_factor=1.0):
+    """Material/PST + pawn structure + center control - the part of the evaluation evaluate_batch vectorizes"""
+    score = evaluation_tier1(board)
+    score += evaluate_pawn_structure(board, aggression_factor)
+    score += evaluate_center_control(board, aggression_factor, AttackMap(board))
+    return score
+
+# Offline batch evaluation - NumPy tables, built on first use
+batch_tables = {}
+
+def get_batch_tables():
+    if batch_tables:
+        return batch_tables
+    
+    def square_matrix(masks):
+        """64x64 0/1 matrix, row = target square, column = square in its mask"""
+        return np.array([[1.0 if mask & chess.BB_SQUARES[square] else 0.0 for square in chess.SQUARES]
+                         for mask in masks])
+    
+    pst = {}
+    for name, tables in (('mg', PST_MIDDLE_GAME), ('eg', PST_END_GAME)):
+        pst[name] = np.array([[table or [0] * 64 for table in tables[color]] for color in (0, 1)], dtype=float)
+    
+    # Contact attackers of every center square, columns in CENTER_SQUARES + EXTENDED_CENTER order
+    center = CENTER_SQUARES + EXTENDED_CENTER
+    contact = {}
+    for color in (0, 1):
+        contact[color] = [square_matrix([chess.BB_PAWN_ATTACKS[not color][target] for target in center]).T,
+                          square_matrix([chess.BB_KNIGHT_ATTACKS[target] for target in center]).T,
+                          square_matrix([chess.BB_KING_ATTACKS[target] for target in center]).T]
+    
+    # Rays out of every center square - (column, ray squares, diagonal)
+    rays = []
+    for column, target in enumerate(center):
+        for file_step, rank_step in ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+            ray = []
+            file, rank = chess.square_file(target) + file_step, chess.square_rank(target) + rank_step
+            while 0 <= file < 8 and 0 <= rank < 8:
+                ray.append(chess.square(file, rank))
+                file, rank = file + file_step, rank + rank_step
+            if ray:
+                rays.append((column, np.array(ray), file_step != 0 and rank_step != 0))
+    
+    ranks = np.arange(64) // 8
+    batch_tables.update(
+        pst=pst, phase_weights=np.array(PHASE_WEIGHTS, dtype=float), center=center,
+        contact=contact, rays=rays, ranks=ranks,
+        black_passed=square_matrix(BLACK_PASSED_MASKS).T, white_passed=square_matrix(WHITE_PASSED_MASKS).T,
+        black_support=square_matrix(BLACK_SUPPORT_MASKS).T)
+    return batch_tables
+
+def board_planes(boards):
+    """(N, 2, 7, 64) 0/1 planes indexed [board][color][piece_type][square], like the PST tables"""
+    masks = np.array([[(0, board.pawns & own, board.knights & own, board.bishops & own,
+                        board.rooks & own, board.queens & own, board.kings & own)
+                       for own in (board.occupied_co[chess.BLACK], board.occupied_co[chess.WHITE])]
+                      for board in boards], dtype='<u8')
+    bits = np.unpackbits(masks.reshape(len(boards), -1).view(np.uint8), axis=1, bitorder='little')
+    return bits.reshape(len(boards), 2, 7, 64).astype(float)
+
+def evaluate_batch(boards, aggression_factor=1.0):
+    """structure_evaluation for many boards at once - array operations across the whole batch.
+    King safety, tactics and mobility stay with the scalar evaluator"""
+    if np is None:
+        raise ImportError("evaluate_batch needs NumPy (pip install numpy)")
+    tables = get_batch_tables()
+    black, white = int(chess.BLACK), int(chess.WHITE)  # Array indices - a bool would act as a mask
+    planes = board_planes(boards)
+    count = len(boards)
+    
+    # 1. Material + piece-square tables, tapered by game phase
+    flat = planes.reshape(count, 2, -1)
+    middlegame = np.einsum('ncs,cs->nc', flat, tables['pst']['mg'].reshape(2, -1))  # (N, color)
+    endgame = np.einsum('ncs,cs->nc', flat, tables['pst']['eg'].reshape(2, -1))
+    phase = np.minimum(planes.sum(axis=(1, 3)) @ tables['phase_weights'], MAX_PHASE)[:, None]
+    material = (middlegame * phase + endgame * (MAX_PHASE - phase)) / MAX_PHASE
+    score = material[:, black] * 1.1 - material[:, white]
+    
+    # 6. Pawn structure - passed pawns, supporters and islands
+    ranks = tables['ranks']
+    black_pawns, white_pawns = planes[:, black, chess.PAWN], planes[:, white, chess.PAWN]
+    black_passed = black_pawns * ((white_pawns @ tables['black_passed']) == 0)
+    white_passed = white_pawns * ((black_pawns @ tables['white_passed']) == 0)
+    score = score + black_passed @ ((ranks + 1) ** 2 * 20 * aggression_factor)
+    score = score + (black_passed * (black_pawns @ tables['black_support'])).sum(axis=1) * 30 * aggression_factor
+    score = score - white_passed @ ((6 - ranks) * 18)
+    for pawns, sign in ((white_pawns, 25), (black_pawns, -25)):
+        files = pawns.reshape(count, 8, 8).max(axis=1)
+        previous = np.concatenate([np.zeros((count, 1)), files[:, :-1]], axis=1)
+        score = score + sign * (files * (1 - previous)).sum(axis=1)
+    
+    # 5. Center occupation and control
+    pieces = planes.max(axis=2)  # (N, color, 64)
+    occupied = pieces.max(axis=1) > 0
+    # Slider control: the first piece along each ray, +1 if it's a black slider of the
+    # ray's kind, -1 for a white one (a ray past the edge of an empty board hits nobody)
+    straight = (planes[:, black, chess.ROOK] + planes[:, black, chess.QUEEN]
+                - planes[:, white, chess.ROOK] - planes[:, white, chess.QUEEN])
+    diagonal = (planes[:, black, chess.BISHOP] + planes[:, black, chess.QUEEN]
+                - planes[:, white, chess.BISHOP] - planes[:, white, chess.QUEEN])
+    rows = np.arange(count)
+    difference = np.zeros((count, len(tables['center'])))
+    for column, ray, is_diagonal in tables['rays']:
+        blocked = occupied[:, ray]
+        blocker = ray[blocked.argmax(axis=1)]
+        sliders = diagonal if is_diagonal else straight
+        difference[:, column] += blocked.any(axis=1) * sliders[rows, blocker]
+    for color, sign in ((black, 1), (white, -1)):
+        pawn_matrix, knight_matrix, king_matrix = tables['contact'][color]
+        difference += sign * (planes[:, color, chess.PAWN] @ pawn_matrix + planes[:, color, chess.KNIGHT] @ knight_matrix
+                              + planes[:, color, chess.KING] @ king_matrix)
+    center_count = len(CENTER_SQUARES)
+    score = score + difference[:, :center_count].sum(axis=1) * 15 * aggression_factor
+    score = score + difference[:, center_count:].sum(axis=1) * 6 * aggression_factor
+    score = score + pieces[:, black][:, CENTER_SQUARES].sum(axis=1) * 50 * aggression_factor
+    score = score - pieces[:, white][:, CENTER_SQUARES].sum(axis=1) * 35
+    return score
+
+def advanced_move_ordering(board, moves, aggression_factor=1.0, depth=0, tt_move=None):
     """INSANE move ordering for maximum alpha-beta efficiency"""
     if not moves:
         return []
     
     move_scores = []
     white_king = board.king(chess.WHITE)
+    killers = get_killers(board)
+    context = ordering_context(board)
     
     for move in moves:
         move_score = 0
         
         try:
-            # 1. Captures (with advanced SEE - Static Exchange Evaluation)
+            # 0. Transposition table move always goes first
+            if move == tt_move:
+                move_scores.append((move, float('inf')))
+                continue
+            
+            # 1. Captures by Static Exchange Evaluation - losing ones go behind the quiet moves
             if board.is_capture(move):
-                victim = board.piece_at(move.to_square)
-                attacker = board.piece_at(move.from_square)
-                
-                if victim and attacker:
-                    victim_value = PIECE_VALUES.get(victim.piece_type, 0)
-                    attacker_value = PIECE_VALUES.get(attacker.piece_type, 0)
-                    
-                    # Advanced capture evaluation
-                    capture_value = victim_value
-                    
-                    # Bonus for capturing with less valuable piece
-                    if victim_value > attacker_value:
-                        capture_value += (victim_value - attacker_value) * 0.5
+                exchange = static_exchange(board, move)
+                if exchange < 0:
+                    move_score += LOSING_CAPTURE_SCORE + exchange
+                else:
+                    victim = board.piece_at(move.to_square)
+                    capture_value = exchange + (PIECE_VALUES.get(victim.piece_type, 0) if victim else PIECE_VALUES[chess.PAWN])
                     
                     # MASSIVE bonus for capturing near enemy king
                     if white_king:
@@ -873,15 +1784,13 @@ def advanced_move_ordering(board, moves, aggression_factor=1.0, depth=0):
                 move_score += 150 * aggression_factor
             
             # 6. Killer move heuristic
-            global killer_moves
-            move_key = f"{depth}_{move.uci()}"
-            if move_key in killer_moves:
-                move_score += killer_moves[move_key]
+            if move == killers[0]:
+                move_score += KILLER_BONUS
+            elif move == killers[1]:
+                move_score += KILLER_BONUS - 100
             
-            # 7. History heuristic
-            global history_table
-            if move.uci() in history_table:
-                move_score += history_table[move.uci()] * 0.1
+            # 7. History, counter-move and continuation history
+            move_score += quiet_move_score(board, move, context) * 0.1
             
             # 8. Promotion moves
             if move.promotion:
@@ -904,203 +1813,1042 @@ def advanced_move_ordering(board, moves, aggression_factor=1.0, depth=0):
     move_scores.sort(key=lambda x: x[1], reverse=True)
     return [move for move, score in move_scores]
 
-def quiescence_search(board, alpha, beta, depth, aggression_factor):
-    """Quiescence search to avoid horizon effect"""
-    if depth <= 0:
-        return evaluate_board(board, aggression_factor)
-    
-    # Stand pat score
-    stand_pat = evaluate_board(board, aggression_factor)
-    if stand_pat >= beta:
-        return beta
-    if stand_pat > alpha:
-        alpha = stand_pat
-    
-    # Only consider captures and checks in quiescence
-    moves = []
-    for move in board.legal_moves:
-        if board.is_capture(move):
-            moves.append(move)
+def staged_moves(board, tt_move):
+    """Lazy staged move picker: hash move, good captures, killers, quiet moves by history,
+    bad captures. Each stage is generated and scored only once the previous one runs dry"""
+    # 1. Hash move - nothing generated at all if it cuts
+    if tt_move and board.is_legal(tt_move):
+        yield tt_move
+    
+    # 2. Winning and equal captures (and promotions) by SEE, then victim value
+    tactical = [move for move in board.generate_legal_moves()
+                if move != tt_move and (move.promotion or board.is_capture(move))]
+    good_captures = []
+    bad_captures = []
+    for move in tactical:
+        exchange = static_exchange(board, move)
+        victim = board.piece_type_at(move.to_square) or chess.PAWN
+        if exchange >= 0:
+            good_captures.append((exchange, PIECE_VALUES[victim], move))
         else:
-            # Check if move gives check
-            board.push(move)
-            if board.is_check():
-                moves.append(move)
-            board.pop()
+            bad_captures.append((exchange, move))
+    good_captures.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+    for _, _, move in good_captures:
+        yield move
+    
+    # 3. Killers that are quiet and legal here
+    killers = [move for move in get_killers(board)
+               if move and move != tt_move and not move.promotion
+               and board.is_legal(move) and not board.is_capture(move)]
+    for move in killers:
+        yield move
+    
+    # 4. The remaining quiet moves by history, counter move and continuation history
+    context = ordering_context(board)
+    quiets = [(quiet_move_score(board, move, context), move) for move in board.generate_legal_moves()
+              if move != tt_move and move not in killers and not move.promotion and not board.is_capture(move)]
+    quiets.sort(key=lambda entry: entry[0], reverse=True)
+    for _, move in quiets:
+        yield move
+    
+    # 5. Captures that lose material on the exchange
+    bad_captures.sort(key=lambda entry: entry[0], reverse=True)
+    for _, move in bad_captures:
+        yield move
+
+def quiescence_search(board, alpha, beta, depth, aggression_factor, tactical_bonus=1.0):
+    """Quiescence search to avoid horizon effect - captures (plus checks on its first ply),
+    every evasion when in check, delta pruning and the transposition table"""
+    board_hash = position_key(board) ^ eval_salt(aggression_factor, tactical_bonus)
+    tt_move = None
+    tt_entry = tt_probe(board_hash)
+    if tt_entry:
+        _, stored_score, stored_type, tt_move = tt_entry
+        if (stored_type == TT_EXACT
+                or (stored_type == TT_LOWERBOUND and stored_score >= beta)
+                or (stored_type == TT_UPPERBOUND and stored_score <= alpha)):
+            return stored_score
     
-    if not moves:
-        return stand_pat
+    original_alpha = alpha
     
-    # Order captures by value
-    moves = advanced_move_ordering(board, moves, aggression_factor, depth)
+    if board.is_check():
+        # No standing pat in check - every evasion gets searched
+        moves = list(board.generate_legal_moves())
+        if not moves:
+            return -MATE_SCORE
+        if depth <= 0 or time_up():
+            return static_eval(board, aggression_factor, tactical_bonus)
+        best_score = float('-inf')
+        moves.sort(key=lambda move: (move == tt_move, board.is_capture(move)), reverse=True)
+    else:
+        # Stand pat score
+        stand_pat = static_eval(board, aggression_factor, tactical_bonus, alpha, beta)
+        if depth <= 0 or time_up() or stand_pat >= beta:
+            return stand_pat
+        
+        # Big delta - not even winning a queen gets back to alpha (no promotion coming)
+        promoting = board.pawns & board.occupied_co[board.turn] & (
+            chess.BB_RANK_7 if board.turn == chess.WHITE else chess.BB_RANK_2)
+        if DELTA_PRUNING and not promoting and stand_pat + SEE_VALUES[chess.QUEEN] + DELTA_MARGIN <= alpha:
+            return stand_pat
+        
+        best_score = stand_pat
+        alpha = max(alpha, stand_pat)
+        
+        # Captures and queen promotions by SEE, then victim
+        scored = []
+        for move in board.generate_legal_moves():
+            capture = board.is_capture(move)
+            if not capture and move.promotion != chess.QUEEN:
+                continue
+            exchange = static_exchange(board, move)
+            # Captures that lose material on the exchange can't rescue the stand pat
+            if SEE_QSEARCH_PRUNING and exchange < 0:
+                continue
+            gain = SEE_VALUES[board.piece_type_at(move.to_square) or (chess.PAWN if capture else 0)]
+            if move.promotion:
+                gain += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+            # Delta pruning - even the whole victim leaves us short of alpha
+            if DELTA_PRUNING and stand_pat + gain + DELTA_MARGIN <= alpha:
+                continue
+            scored.append((move == tt_move, True, exchange, gain, move))
+        
+        # Quiet checks on the first qsearch ply only, found from attack masks
+        if depth == QSEARCH_DEPTH:
+            for move in board.generate_legal_moves():
+                if not move.promotion and not board.is_capture(move) and gives_check_fast(board, move):
+                    scored.append((move == tt_move, False, 0, 0, move))
+        
+        scored.sort(key=lambda entry: entry[:4], reverse=True)
+        moves = [entry[4] for entry in scored]
     
+    best_move = None
     for move in moves:
+        board.push(move)
         try:
-            board.push(move)
-            score = -quiescence_search(board, -beta, -alpha, depth - 1, aggression_factor)
+            score = -quiescence_search(board, -beta, -alpha, depth - 1, aggression_factor, tactical_bonus)
+        finally:
             board.pop()
-            
-            if score >= beta:
-                return beta
-            if score > alpha:
-                alpha = score
-        except:
-            try:
-                board.pop()
-            except:
-                pass
+        if search_stopped():
+            break
+        
+        if score > best_score:
+            best_score = score
+            best_move = move
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
     
-    return alpha
+    # Depth-0 entry - never overwrite what the main search stored for this position
+    if not search_stopped() and not (tt_entry and tt_entry[0] > 0):
+        tt_type = TT_EXACT
+        if best_score <= original_alpha:
+            tt_type = TT_UPPERBOUND
+        elif best_score >= beta:
+            tt_type = TT_LOWERBOUND
+        tt_store(board_hash, 0, best_score, tt_type, best_move)
+    
+    return best_score
+
+def is_pondering():
+    """True inside the background ponder search"""
+    return ponder_state['active'] and threading.current_thread() is ponder_state['thread']
+
+def allocate_time(think_time, game_clock=None):
+    """Soft and hard time limits (seconds) for one move.
+    game_clock = {'remaining': s, 'increment': s, 'moves_to_go': n} switches from
+    the fixed think_time to spending a share of the clock plus most of the increment"""
+    if not game_clock:
+        return think_time * SOFT_TIME_RATIO, think_time
+    
+    remaining = game_clock['remaining']
+    increment = game_clock.get('increment', 0.0)
+    moves_to_go = game_clock.get('moves_to_go') or DEFAULT_MOVES_TO_GO
+    usable = max(0.05, remaining - CLOCK_SAFETY_MARGIN)
+    
+    soft = min(usable, remaining / moves_to_go + increment * 0.8)
+    hard = min(usable, max(soft * 3, soft + increment))
+    return soft, hard
+
+def start_search_clock(soft_time, hard_time):
+    """Reset this thread's clock - every search thread/process owns one"""
+    search_clock.start = time.time()
+    search_clock.soft_time = soft_time
+    search_clock.base_soft_time = soft_time
+    search_clock.hard_time = hard_time
+    search_clock.nodes = 0
+    search_clock.next_check = TIME_CHECK_INTERVAL
+    search_clock.stopped = False
 
-def minimax_with_pruning(board, depth, alpha, beta, maximizing_player, start_time, max_time=30, aggression_factor=1.0, tactical_bonus=1.0):
-    """ULTRA ADVANCED minimax with ALL optimizations"""
+def clock_expired(soft=False):
+    """Read the clock: hard (or soft) limit passed, SMP halt or ponder miss"""
+    if search_stop is not None and search_stop.is_set():
+        return True
+    
+    start = search_clock.start
+    if is_pondering():
+        if ponder_state['stop'].is_set():
+            return True
+        if ponder_state['hit_time'] is None:
+            return False  # Pondering is open-ended until the hit
+        start = ponder_state['hit_time']
+    
+    limit = search_clock.soft_time if soft else search_clock.hard_time
+    return time.time() - start > limit
+
+def time_up():
+    """Per-node check - only reads the clock every TIME_CHECK_INTERVAL nodes"""
+    if search_clock.stopped:
+        return True
+    search_clock.nodes += 1
+    if search_clock.nodes >= search_clock.next_check:
+        search_clock.next_check = search_clock.nodes + TIME_CHECK_INTERVAL
+        search_clock.stopped = clock_expired()
+    return search_clock.stopped
+
+def search_stopped():
+    """No clock read at all - for loops over child moves"""
+    return search_clock.stopped
+
+def extend_soft_time(factor):
+    """Unstable best move - allow more iterations, never beyond the hard limit"""
+    search_clock.soft_time = min(search_clock.hard_time, search_clock.base_soft_time * factor)
+
+def static_eval(board, aggression_factor, tactical_bonus, alpha=None, beta=None):
+    """evaluate_board from the side to move's point of view (it scores for Black).
+    With a window the evaluation is lazy - outside it only a bound is guaranteed"""
+    if LAZY_EVAL and alpha is not None:
+        if board.turn == chess.BLACK:
+            return lazy_evaluate(board, aggression_factor, tactical_bonus, alpha, beta)
+        return -lazy_evaluate(board, aggression_factor, tactical_bonus, -beta, -alpha)
+    score = evaluate_board(board, aggression_factor, tactical_bonus)
+    return score if board.turn == chess.BLACK else -score
+
+def prune_late_move(board, move, index, depth, futile, selective):
+    """Forward pruning of a quiet move: futility at frontier nodes, move count late in the list.
+    Never in check or around mate bounds (selective False) - an evasion or the only saving move
+    may sit late in the list. The check test (attack masks, no push/pop) only runs once pruning could apply"""
+    if index == 0 or not selective:
+        return False
+    if not futile and not (LATE_MOVE_PRUNING and depth < len(LATE_MOVE_COUNTS) and index >= LATE_MOVE_COUNTS[depth]):
+        return False
+    return not (board.is_capture(move) or move.promotion or gives_check_fast(board, move))
+
+def minimax_with_pruning(board, depth, alpha, beta, aggression_factor=1.0, tactical_bonus=1.0, allow_null=True):
+    """ULTRA ADVANCED negamax PVS with ALL optimizations - scores are from the side to move"""
     
     # Time check
-    if time.time() - start_time > max_time:
-        return evaluate_board(board, aggression_factor, tactical_bonus)
+    if time_up():
+        return static_eval(board, aggression_factor, tactical_bonus)
     
-    # Base case with quiescence search
-    if depth == 0:
-        return quiescence_search(board, alpha, beta, 3, aggression_factor)
+    # Base case with quiescence search (reductions can overshoot zero)
+    if depth <= 0:
+        return quiescence_search(board, alpha, beta, QSEARCH_DEPTH, aggression_factor, tactical_bonus)
     
     if board.is_game_over():
-        return evaluate_board(board, aggression_factor, tactical_bonus)
+        if board.is_checkmate():
+            return -MATE_SCORE - depth  # Nearer mates score higher for the winner
+        return static_eval(board, aggression_factor, tactical_bonus)
     
     # Transposition table lookup
-    board_hash = hash(board.fen())
-    if board_hash in transposition_table:
-        stored_depth, stored_score, stored_type = transposition_table[board_hash]
+    board_hash = position_key(board) ^ eval_salt(aggression_factor, tactical_bonus)
+    tt_move = None
+    tt_entry = tt_probe(board_hash)
+    if tt_entry:
+        stored_depth, stored_score, stored_type, tt_move = tt_entry
         if stored_depth >= depth:
-            if stored_type == 'exact':
+            if stored_type == TT_EXACT:
                 return stored_score
-            elif stored_type == 'lowerbound' and stored_score >= beta:
+            elif stored_type == TT_LOWERBOUND and stored_score >= beta:
                 return stored_score
-            elif stored_type == 'upperbound' and stored_score <= alpha:
+            elif stored_type == TT_UPPERBOUND and stored_score <= alpha:
                 return stored_score
     
-    moves = list(board.legal_moves)
-    if not moves:
-        return evaluate_board(board, aggression_factor, tactical_bonus)
+    # Tablebase cutoff - WDL is exact right after a capture or pawn move
+    if board.halfmove_clock == 0 and in_tablebase_range(board):
+        wdl = probe_wdl(board)
+        if wdl is not None:
+            score = tablebase_score(board, wdl, depth)
+            tt_store(board_hash, depth, score, TT_EXACT)
+            return score
+    
+    in_check = board.is_check()
+    
+    # Selective pruning near the leaves, off in check and around mate scores
+    selective = not in_check and abs(alpha) < MATE_THRESHOLD and abs(beta) < MATE_THRESHOLD
+    futile = False
+    if selective and depth < max(len(FUTILITY_MARGINS), len(REVERSE_FUTILITY_MARGINS), len(RAZOR_MARGINS)):
+        static_score = static_eval(board, aggression_factor, tactical_bonus)
+        
+        # Reverse futility - so far above beta that no reply will bring it back
+        if (REVERSE_FUTILITY_PRUNING and depth < len(REVERSE_FUTILITY_MARGINS)
+                and static_score - REVERSE_FUTILITY_MARGINS[depth] >= beta):
+            return static_score - REVERSE_FUTILITY_MARGINS[depth]
+        
+        # Razoring - hopeless quiet position, let the captures prove otherwise
+        if RAZORING and depth < len(RAZOR_MARGINS) and static_score + RAZOR_MARGINS[depth] <= alpha:
+            razor_score = quiescence_search(board, alpha, beta, QSEARCH_DEPTH, aggression_factor, tactical_bonus)
+            if razor_score <= alpha:
+                return razor_score
+        
+        futile = (FUTILITY_PRUNING and depth < len(FUTILITY_MARGINS)
+                  and static_score + FUTILITY_MARGINS[depth] <= alpha)
+    
+    # Null-move pruning - pass, and if the opponent still can't reach beta, cut
+    if (NULL_MOVE_PRUNING and allow_null and depth >= NULL_MOVE_MIN_DEPTH
+            and abs(beta) < MATE_THRESHOLD and not in_check
+            and not is_pawn_endgame(board, board.turn)):
+        reduction = NULL_MOVE_REDUCTION + (1 if depth >= NULL_MOVE_DEEP_DEPTH else 0)
+        board.push(chess.Move.null())
+        null_score = -minimax_with_pruning(board, depth - 1 - reduction, -beta, -beta + 1,
+                                           aggression_factor, tactical_bonus, allow_null=False)
+        board.pop()
+        
+        if null_score >= beta and not search_stopped():
+            if not NULL_MOVE_VERIFICATION:
+                return beta
+            # Verification search guards against zugzwang the material test misses
+            verify_score = minimax_with_pruning(board, depth - reduction, beta - 1, beta,
+                                                aggression_factor, tactical_bonus, allow_null=False)
+            if verify_score >= beta:
+                return beta
     
-    # Advanced move ordering
-    moves = advanced_move_ordering(board, moves, aggression_factor, depth)
+    # Staged move picker (hash move first) - most cut nodes never generate the quiet moves
+    moves = staged_moves(board, tt_move)
     
     original_alpha = alpha
+    best_score = float('-inf')
     best_move = None
+    searched = 0
     
-    if maximizing_player:  # AI (Black) maximizing
-        max_eval = float('-inf')
+    for i, move in enumerate(moves):
+        if search_stopped():
+            break
+        if prune_late_move(board, move, i, depth, futile, selective):
+            continue
+        
+        quiet = not board.is_capture(move) and not move.promotion
+        board.push(move)
+        try:
+            # Late Move Reduction (LMR)
+            reduction = 0
+            if LATE_MOVE_REDUCTIONS and depth >= 3 and i >= 4 and quiet and not board.is_check():
+                reduction = 1
+            
+            if searched == 0:
+                # Principal variation move - full window
+                score = -minimax_with_pruning(board, depth - 1, -beta, -alpha, aggression_factor, tactical_bonus)
+            else:
+                # Everything else has to prove itself on a null window first
+                score = -minimax_with_pruning(board, depth - 1 - reduction, -alpha - 1, -alpha,
+                                              aggression_factor, tactical_bonus)
+                if reduction > 0 and score > alpha:
+                    score = -minimax_with_pruning(board, depth - 1, -alpha - 1, -alpha,
+                                                  aggression_factor, tactical_bonus)
+                if alpha < score < beta:
+                    score = -minimax_with_pruning(board, depth - 1, -beta, -alpha,
+                                                  aggression_factor, tactical_bonus)
+        finally:
+            board.pop()
         
-        for i, move in enumerate(moves):
-            if time.time() - start_time > max_time:
+        # The clock ran out inside this child - its score is made up, the caller discards ours too
+        if search_stopped():
+            break
+        searched += 1
+        
+        if score > best_score:
+            best_score = score
+            best_move = move
+        
+        if score > alpha:
+            alpha = score
+        
+        if alpha >= beta:
+            if quiet:
+                record_cutoff(board, move, depth)
+            
+            break  # Beta cutoff
+    
+    # An interrupted node proves nothing - whatever it returns, callers check search_stopped()
+    if search_stopped() or best_move is None:
+        return alpha
+    
+    tt_type = TT_EXACT
+    if best_score <= original_alpha:
+        tt_type = TT_UPPERBOUND
+    elif best_score >= beta:
+        tt_type = TT_LOWERBOUND
+    tt_store(board_hash, depth, best_score, tt_type, best_move)
+    
+    return best_score
+
+def extract_pv(board, first_move, max_length, aggression_factor, tactical_bonus):
+    """Principal variation: the root move followed by the hash moves it leads to"""
+    pv = [first_move]
+    salt = eval_salt(aggression_factor, tactical_bonus)
+    seen = set()
+    board.push(first_move)
+    try:
+        while len(pv) < max_length:
+            key = position_key(board)
+            if key in seen:  # Repetition - the line would never end
                 break
-                
+            seen.add(key)
+            tt_entry = tt_probe(key ^ salt)
+            if not tt_entry or not tt_entry[3] or tt_entry[3] not in board.legal_moves:
+                break
+            pv.append(tt_entry[3])
+            board.push(tt_entry[3])
+    finally:
+        for _ in pv:
+            board.pop()
+    return pv
+
+def search_root(board, root_moves, depth, alpha, beta, aggression_factor, tactical_bonus, root_scores, verbose):
+    """One root iteration inside the (alpha, beta) window.
+    Returns (move, score, nodes, complete) - score <= alpha / >= beta means the window failed.
+    Cut short, move and score cover only the moves whose subtrees finished (scores in root_scores)"""
+    best_move = None
+    best_score = float('-inf')
+    start_nodes = search_clock.nodes
+    
+    for i, move in enumerate(root_moves):
+        if search_stopped() or clock_expired():
+            if verbose:
+                print(f"⏰ Time limit reached at depth {depth}, move {i+1}")
+            return best_move, best_score, search_clock.nodes - start_nodes, False
+        
+        try:
+            board.push(move)
+            
+            # Full window for the PV move, null window (then re-search) for the others
+            if i == 0:
+                score = -minimax_with_pruning(board, depth - 1, -beta, -alpha,
+                                              aggression_factor, tactical_bonus)
+            else:
+                score = -minimax_with_pruning(board, depth - 1, -alpha - 1, -alpha,
+                                              aggression_factor, tactical_bonus)
+                if alpha < score < beta:
+                    score = -minimax_with_pruning(board, depth - 1, -beta, -alpha,
+                                                  aggression_factor, tactical_bonus)
+            
+            board.pop()
+        except Exception as e:
+            print(f"Error evaluating {move.uci()}: {e}")
             try:
-                board.push(move)
-                
-                # Late Move Reduction (LMR)
-                reduction = 0
-                if (depth >= 3 and i >= 4 and 
-                    not board.is_capture(move) and not board.is_check()):
-                    reduction = 1
-                
-                eval_score = -minimax_with_pruning(board, depth - 1 - reduction, -beta, -alpha, 
-                                                 False, start_time, max_time, aggression_factor, tactical_bonus)
-                
-                # Re-search if LMR failed
-                if reduction > 0 and eval_score > alpha:
-                    eval_score = -minimax_with_pruning(board, depth - 1, -beta, -alpha, 
-                                                     False, start_time, max_time, aggression_factor, tactical_bonus)
-                
                 board.pop()
-                
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = move
-                
-                alpha = max(alpha, eval_score)
-                
-                if beta <= alpha:
-                    # Update killer moves
-                    global killer_moves
-                    killer_key = f"{depth}_{move.uci()}"
-                    killer_moves[killer_key] = killer_moves.get(killer_key, 0) + depth * depth
-                    
-                    # Update history table
-                    global history_table
-                    history_table[move.uci()] = history_table.get(move.uci(), 0) + depth * depth
-                    
-                    break  # Alpha-beta cutoff
-                    
             except:
-                try:
-                    board.pop()
-                except:
-                    pass
-                continue
+                pass
+            continue
         
-        # Store in transposition table
-        tt_type = 'exact'
-        if max_eval <= original_alpha:
-            tt_type = 'upperbound'
-        elif max_eval >= beta:
-            tt_type = 'lowerbound'
+        # Cut short inside this move - only fully searched moves count
+        if search_stopped():
+            if verbose:
+                print(f"⏰ Time limit reached at depth {depth}, move {i+1}")
+            return best_move, best_score, search_clock.nodes - start_nodes, False
         
-        transposition_table[board_hash] = (depth, max_eval, tt_type)
-        return max_eval
+        root_scores[move] = score
+        if verbose and i < 5:
+            move_type = "CAPTURE" if board.is_capture(move) else "MOVE"
+            print(f"  💀 {move_type} {i+1}: {move.uci()} = {score}")
+        
+        if score > best_score:
+            best_score = score
+            best_move = move
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break  # Fail high - the caller widens the window
+    
+    return best_move, best_score, search_clock.nodes - start_nodes, True
+
+def iterative_deepening(board, ordered_moves, depth, aggression_factor, tactical_bonus,
+                        first_depth=1, on_depth_done=None, verbose=True, skip_depth=None):
+    """Root iterative deepening loop under the thread's search clock, with aspiration
+    windows around the previous score and the root re-sorted PV first every depth.
+    skip_depth(d) lets Lazy SMP helpers leave out intermediate depths.
+    Returns (move, score, nodes, deepest completed depth); the PV lands in search_info"""
+    best_move = None
+    best_score = float('-inf')
+    nodes_searched = 0
+    completed_depth = 0
+    root_moves = list(ordered_moves)
+    root_scores = {}
+    search_info.update(depth=0, score=0, pv=[])
     
-    else:  # Human (White) minimizing
-        min_eval = float('inf')
+    for current_depth in range(first_depth, depth + 1):
+        if skip_depth and best_move and current_depth < depth and skip_depth(current_depth):
+            continue
+        if clock_expired(soft=True):
+            if verbose:
+                print(f"⏰ Time limit approaching, stopping at depth {current_depth-1}")
+            break
+        
+        # Aspiration window around the last score, widened on every fail
+        window = ASPIRATION_WINDOW
+        if current_depth >= ASPIRATION_MIN_DEPTH and best_move and abs(best_score) < MATE_THRESHOLD:
+            alpha, beta = best_score - window, best_score + window
+        else:
+            alpha, beta = float('-inf'), float('inf')
         
-        for i, move in enumerate(moves):
-            if time.time() - start_time > max_time:
+        while True:
+            iteration_scores = {}
+            current_best, current_best_score, nodes, iteration_complete = search_root(
+                board, root_moves, current_depth, alpha, beta, aggression_factor, tactical_bonus,
+                iteration_scores, verbose and current_depth == depth)
+            root_scores.update(iteration_scores)
+            nodes_searched += nodes
+            if not iteration_complete or current_best is None:
                 break
-                
+            
+            window *= 2
+            if current_best_score <= alpha:
+                alpha = current_best_score - window if window < ASPIRATION_MAX_WINDOW else float('-inf')
+            elif current_best_score >= beta:
+                beta = current_best_score + window if window < ASPIRATION_MAX_WINDOW else float('inf')
+            else:
+                break
+            if verbose:
+                print(f"🔁 Aspiration fail at depth {current_depth} ({current_best_score}) - widening")
+        
+        # A cut-short iteration only counts when a finished move beat the previous best's
+        # finished score at this depth with an exact (in-window) score
+        if not iteration_complete and best_move:
+            previous_score = iteration_scores.get(best_move)
+            if (current_best == best_move or previous_score is None
+                    or not (alpha < current_best_score < beta) or current_best_score <= previous_score):
+                current_best = None
+        
+        if current_best:
+            # Best move changed between iterations - give the search more time
+            if iteration_complete and best_move and current_best != best_move:
+                extend_soft_time(INSTABILITY_EXTENSION)
+            
+            best_move = current_best
+            best_score = current_best_score
+            
+            # PV move first, then the rest by this iteration's scores
+            root_moves.sort(key=lambda move: (move != best_move, -root_scores.get(move, float('-inf'))))
+            
+            # The PV always belongs to the move and score handed back
+            pv = extract_pv(board, best_move, current_depth, aggression_factor, tactical_bonus)
+            if iteration_complete:
+                completed_depth = current_depth
+                search_info.update(depth=current_depth, score=best_score, pv=pv)
+                if on_depth_done:
+                    on_depth_done(current_depth, best_move, best_score, nodes_searched)
+            else:
+                search_info.update(score=best_score, pv=pv)
+            
+            if verbose and current_depth >= 3:  # Start showing intermediate results
+                pv_text = ' '.join(move.uci() for move in search_info['pv'])
+                print(f"🧠 Depth {current_depth}: {best_move.uci()} = {best_score} | PV: {pv_text}")
+            
+            # Forced mate found - deeper iterations cannot change the verdict
+            if iteration_complete and abs(best_score) >= MATE_THRESHOLD:
+                if verbose:
+                    print(f"💀 Forced mate found at depth {current_depth}!")
+                break
+        
+        if not iteration_complete:
+            break
+    
+    return best_move, best_score, nodes_searched, completed_depth
+
+def perturb_helper_ordering(worker_id, ordered_moves):
+    """Search diversity for helper worker_id: jittered root order (best move kept first)
+    and a random history bonus, so helpers don't walk the main worker's tree"""
+    rng = random.Random(worker_id * 7919 + tt_generation)
+    rest = sorted(enumerate(ordered_moves[1:]), key=lambda entry: entry[0] + rng.uniform(0, SMP_ROOT_JITTER))
+    for slot in range(len(history_table)):
+        history_add(history_table, history_stamps, slot, rng.randrange(SMP_HISTORY_JITTER))
+    return ordered_moves[:1] + [move for _, move in rest]
+
+def smp_worker(worker_id, shared_table, job_queue, stop_event, result_queue):
+    """Lazy SMP helper process - lives across moves, searching one root per job
+    (None shuts it down) and reporting every finished depth tagged with the job id"""
+    global search_stop, tt_generation
+    tt_attach(shared_table)
+    search_stop = stop_event
+    
+    while True:
+        job = job_queue.get()
+        if job is None:
+            return
+        
+        job_id, depth = job['id'], job['depth']
+        tt_generation = job['generation']
+        age_move_heuristics()
+        start_search_clock(job['soft_time'], job['hard_time'])
+        nodes_searched = 0
+        
+        try:
+            board = SearchBoard(job['fen'])
+            for uci in job['moves']:
+                board.push(chess.Move.from_uci(uci))
+            
+            ordered_moves = advanced_move_ordering(board, list(board.legal_moves), job['aggression'], depth)
+            skip_depth = None
+            if worker_id > 0:
+                ordered_moves = perturb_helper_ordering(worker_id, ordered_moves)
+                skip_depth = lambda current_depth: (current_depth + worker_id) % SMP_SKIP_CYCLE == 0
+            
+            def report(current_depth, move, score, nodes):
+                result_queue.put((job_id, worker_id, current_depth, move.uci(), score, nodes))
+            
+            _, _, nodes_searched, _ = iterative_deepening(
+                board, ordered_moves, depth, job['aggression'], job['tactical_bonus'],
+                on_depth_done=report, verbose=False, skip_depth=skip_depth)
+        except Exception as e:
+            print(f"🔥 SMP worker {worker_id} error: {e}")
+        finally:
+            result_queue.put((job_id, worker_id, None, None, None, nodes_searched))
+
+# Lazy SMP worker pool - started once, kept alive across moves
+smp_pool = {'processes': [], 'jobs': [], 'results': None, 'stop': None, 'table': None, 'next_id': 0}
+
+def shutdown_smp_pool():
+    for job_queue in smp_pool['jobs']:
+        job_queue.put(None)
+    for process in smp_pool['processes']:
+        process.join(timeout=1.0)
+        if process.is_alive():
+            process.terminate()
+    smp_pool.update(processes=[], jobs=[], results=None, stop=None, table=None)
+
+def get_smp_pool(workers):
+    """The running pool - restarted only when the worker count or the shared table changed"""
+    if (len(smp_pool['processes']) == workers and smp_pool['table'] is tt_shared
+            and all(process.is_alive() for process in smp_pool['processes'])):
+        return smp_pool
+    
+    shutdown_smp_pool()
+    # Spawned, never forked - the caller is a search thread next to the pygame loop, and a fork
+    # would copy that half-running process into every worker
+    context = multiprocessing.get_context('spawn')
+    smp_pool.update(results=context.Queue(), stop=context.Event(), table=tt_shared)
+    for worker_id in range(workers):
+        job_queue = context.Queue()
+        process = context.Process(target=smp_worker,
+                                  args=(worker_id, tt_shared, job_queue, smp_pool['stop'], smp_pool['results']))
+        process.daemon = True
+        process.start()
+        smp_pool['jobs'].append(job_queue)
+        smp_pool['processes'].append(process)
+    return smp_pool
+
+def lazy_smp_search(board, depth, aggression_factor, tactical_bonus, workers):
+    """Run N pooled worker processes on the same root sharing the transposition table,
+    under the calling thread's search clock.
+    Returns the deepest completed result as (move, score, nodes, depth)"""
+    pool = get_smp_pool(workers)
+    start_time = time.time()
+    
+    # While pondering only the coordinator knows when to stop
+    if is_pondering():
+        soft_time = hard_time = float('inf')
+    else:
+        soft_time, hard_time = search_clock.soft_time, search_clock.hard_time
+    
+    pool['next_id'] += 1
+    job = {
+        'id': pool['next_id'], 'fen': board.root().fen(), 'moves': [move.uci() for move in board.move_stack],
+        'depth': depth, 'soft_time': soft_time, 'hard_time': hard_time, 'generation': tt_generation,
+        'aggression': aggression_factor, 'tactical_bonus': tactical_bonus
+    }
+    pool['stop'].clear()
+    for job_queue in pool['jobs']:
+        job_queue.put(job)
+    
+    best = (None, float('-inf'), 0, 0)  # move, score, depth, worker
+    finished = 0
+    nodes_searched = 0
+    halt_time = None
+    
+    while finished < workers:
+        if halt_time is None and clock_expired():
+            pool['stop'].set()
+            halt_time = time.time()
+        if halt_time is not None and time.time() - halt_time > 2.0:
+            # A worker that won't stop can't take the next job - start a fresh pool next time
+            print("🔥 Lazy SMP worker did not stop - restarting the pool")
+            shutdown_smp_pool()
+            break
+        
+        try:
+            job_id, worker_id, result_depth, uci, score, nodes = pool['results'].get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if job_id != job['id']:
+            continue  # Late report from an earlier search
+        
+        if result_depth is None:
+            finished += 1
+            nodes_searched += nodes
+            continue
+        
+        # Deepest completed iteration wins, earlier worker breaks ties
+        if result_depth > best[2] or (result_depth == best[2] and worker_id < best[3]):
+            best = (chess.Move.from_uci(uci), score, result_depth, worker_id)
+        # Past the soft limit no new iteration is worth starting - the workers only know it
+        # themselves when not pondering, after a ponder hit the coordinator has to tell them
+        if result_depth >= depth or abs(score) >= MATE_THRESHOLD or clock_expired(soft=True):
+            pool['stop'].set()
+    
+    if pool['stop'] is not None:
+        pool['stop'].set()
+    
+    best_move, best_score, best_depth, best_worker = best
+    if best_move:
+        pv = extract_pv(board, best_move, best_depth, aggression_factor, tactical_bonus)
+        search_info.update(depth=best_depth, score=best_score, pv=pv)
+        print(f"🧠 Lazy SMP: {workers} workers, depth {best_depth} by worker {best_worker} in {time.time() - start_time:.2f}s")
+    return best_move, best_score, nodes_searched, best_depth
+
+def open_analysis_socket(address, listen=False):
+    """TCP ("host:port") or Unix ("unix:/path") socket for the analysis farm"""
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if listen:
+            if os.path.exists(path):
+                os.unlink(path)
+            sock.bind(path)
+            sock.listen()
+        else:
+            sock.connect(path)
+        return sock
+    
+    host, port = address.rsplit(':', 1)
+    if listen:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, int(port)))
+        sock.listen()
+        return sock
+    return socket.create_connection((host, int(port)))
+
+def search_root_move(job):
+    """Score one root move against the current alpha bound (runs on a worker host).
+    Reports whether the clock cut it short, the nodes it took, and the PV when the move beat alpha"""
+    board = SearchBoard(job['fen'])
+    for uci in job['moves']:
+        board.push(chess.Move.from_uci(uci))
+    board.push(chess.Move.from_uci(job['move']))
+    
+    start_search_clock(job['max_time'], job['max_time'])
+    alpha = job['alpha']
+    args = (job['aggression'], job['tactical_bonus'])
+    
+    # Null window against alpha first, full re-search only if the move beats it
+    score = -minimax_with_pruning(board, job['depth'], -alpha - 1, -alpha, *args)
+    pv = []
+    if score > alpha and not search_stopped():
+        score = -minimax_with_pruning(board, job['depth'], float('-inf'), float('inf'), *args)
+        move = board.pop()
+        pv = [pv_move.uci() for pv_move in extract_pv(board, move, job['depth'] + 1, *args)]
+    return {'move': job['move'], 'score': score, 'interrupted': search_stopped(), 'pv': pv,
+            'nodes': search_clock.nodes}
+
+def serve_analysis_connection(conn):
+    """Answer search jobs from one coordinator connection until it hangs up"""
+    tt_new_search()
+    with conn, conn.makefile('rw') as stream:
+        for line in stream:
             try:
+                result = search_root_move(json.loads(line))
+            except Exception as e:
+                result = {'error': str(e)}
+            stream.write(json.dumps(result) + "\n")
+            stream.flush()
+
+def analysis_worker(address):
+    """Analysis farm worker: python main.py --worker host:port (or unix:/path).
+    Every connection gets its own process; they share this host's transposition table"""
+    listener = open_analysis_socket(address, listen=True)
+    context = multiprocessing.get_context()
+    print(f"⚔️ DESTROYER analysis worker listening on {address}")
+    
+    with listener:
+        while True:
+            conn, _ = listener.accept()
+            process = context.Process(target=serve_analysis_connection, args=(conn,))
+            process.daemon = True
+            process.start()
+            conn.close()
+
+def start_local_workers(count):
+    """Local stand-in for the analysis farm - returns (addresses, processes)"""
+    context = multiprocessing.get_context()
+    socket_dir = tempfile.mkdtemp(prefix='chess_ai_')
+    addresses = [f"unix:{os.path.join(socket_dir, f'worker{i}.sock')}" for i in range(count)]
+    processes = []
+    
+    for address in addresses:
+        # Not daemonic - workers fork a child per connection
+        process = context.Process(target=analysis_worker, args=(address,))
+        process.start()
+        processes.append(process)
+    
+    for address in addresses:
+        path = address[len('unix:'):]
+        while not os.path.exists(path):
+            time.sleep(0.01)
+    
+    return addresses, processes
+
+def distributed_root_search(board, ordered_moves, depth, aggression_factor, tactical_bonus, hosts):
+    """Young Brothers Wait root splitting: the first move is searched locally,
+    its siblings are farmed out to the hosts with the current alpha bound.
+    Returns (move, score, nodes, deepest completed depth)"""
+    connections = []
+    for address in hosts:
+        try:
+            sock = open_analysis_socket(address)
+            connections.append((address, sock, sock.makefile('rw')))
+        except OSError as e:
+            print(f"🔥 Analysis host {address} unavailable: {e}")
+    
+    if not connections:
+        return iterative_deepening(board, ordered_moves, depth, aggression_factor, tactical_bonus)
+    
+    root_fen = board.root().fen()
+    move_ucis = [move.uci() for move in board.move_stack]
+    root_moves = list(ordered_moves)
+    root_scores = {}
+    best_move = None
+    best_score = float('-inf')
+    nodes_searched = 0
+    completed_depth = 0
+    hard_deadline = search_clock.start + search_clock.hard_time  # Farm threads have no clock of their own
+    
+    try:
+        for current_depth in range(1, depth + 1):
+            if clock_expired(soft=True):
+                print(f"⏰ Time limit approaching, stopping at depth {current_depth-1}")
+                break
+            
+            # Last depth's best move is the eldest brother, the rest by last depth's scores
+            if best_move:
+                root_moves.sort(key=lambda move: (move != best_move, -root_scores.get(move, float('-inf'))))
+            
+            # Eldest brother searched locally with a full window
+            first_move = root_moves[0]
+            local_nodes = search_clock.nodes
+            board.push(first_move)
+            first_score = -minimax_with_pruning(board, current_depth - 1, float('-inf'), float('inf'),
+                                                aggression_factor, tactical_bonus)
+            board.pop()
+            nodes_searched += search_clock.nodes - local_nodes
+            if search_stopped():
+                print(f"⏰ Time limit reached at depth {current_depth} - keeping depth {completed_depth}")
+                break
+            
+            # Only fully searched moves land in depth_scores; an interrupted job spoils the depth
+            depth_scores = {first_move: first_score}
+            state = {'move': first_move, 'score': first_score, 'pv': None, 'interrupted': False, 'nodes': 0}
+            lock = threading.Lock()
+            jobs = queue.Queue()
+            for move in root_moves[1:]:
+                jobs.put(move)
+            
+            def farm_out(address, stream):
+                while time.time() < hard_deadline:
+                    try:
+                        move = jobs.get_nowait()
+                    except queue.Empty:
+                        return
+                    with lock:
+                        alpha = state['score']
+                    job = {
+                        'fen': root_fen, 'moves': move_ucis, 'move': move.uci(),
+                        'depth': current_depth - 1, 'alpha': alpha,
+                        'max_time': hard_deadline - time.time(),
+                        'aggression': aggression_factor, 'tactical_bonus': tactical_bonus
+                    }
+                    try:
+                        stream.write(json.dumps(job) + "\n")
+                        stream.flush()
+                        result = json.loads(stream.readline())
+                        score = result['score']
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"🔥 Analysis host {address} failed: {e}")
+                        jobs.put(move)  # Somebody else (or the local fallback) takes it
+                        return
+                    with lock:
+                        state['nodes'] += result.get('nodes', 0)
+                        if result.get('interrupted'):
+                            state['interrupted'] = True
+                            return
+                        depth_scores[move] = score
+                        if score > state['score']:
+                            state.update(move=move, score=score, pv=result.get('pv'))
+            
+            threads = [threading.Thread(target=farm_out, args=(address, stream), daemon=True)
+                       for address, _, stream in connections]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            # Jobs left behind by dead hosts are searched here
+            local_nodes = search_clock.nodes
+            while not jobs.empty() and not state['interrupted'] and not clock_expired():
+                move = jobs.get_nowait()
                 board.push(move)
-                
-                # Late Move Reduction for human too
-                reduction = 0
-                if (depth >= 3 and i >= 4 and 
-                    not board.is_capture(move) and not board.is_check()):
-                    reduction = 1
-                
-                eval_score = -minimax_with_pruning(board, depth - 1 - reduction, -beta, -alpha, 
-                                                 True, start_time, max_time, aggression_factor, tactical_bonus)
-                
-                if reduction > 0 and eval_score < beta:
-                    eval_score = -minimax_with_pruning(board, depth - 1, -beta, -alpha, 
-                                                     True, start_time, max_time, aggression_factor, tactical_bonus)
-                
+                score = -minimax_with_pruning(board, current_depth - 1, float('-inf'), float('inf'),
+                                              aggression_factor, tactical_bonus)
                 board.pop()
-                
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                
-                if beta <= alpha:
-                    break  # Alpha-beta cutoff
-                    
-            except:
-                try:
-                    board.pop()
-                except:
-                    pass
-                continue
-        
-        # Store in transposition table
-        tt_type = 'exact'
-        if min_eval <= original_alpha:
-            tt_type = 'upperbound'
-        elif min_eval >= beta:
-            tt_type = 'lowerbound'
+                if search_stopped():
+                    state['interrupted'] = True
+                    break
+                depth_scores[move] = score
+                if score > state['score']:
+                    state.update(move=move, score=score, pv=None)
             
-        transposition_table[board_hash] = (depth, min_eval, tt_type)
-        return min_eval
-
-def get_best_move(board, difficulty):
-    """DESTROYER AI - Finds the most BRUTAL moves possible"""
-    global transposition_table, killer_moves, history_table
+            # Remote nodes come back in the replies, local ones off this thread's clock
+            nodes_searched += state['nodes'] + search_clock.nodes - local_nodes
+            if state['interrupted'] or len(depth_scores) < len(root_moves):
+                print(f"⏰ Depth {current_depth} cut short - keeping depth {completed_depth}")
+                break
+            
+            best_move = state['move']
+            best_score = state['score']
+            root_scores.update(depth_scores)
+            completed_depth = current_depth
+            # The host that proved the best move reports its PV; local moves come from this TT
+            if state['pv']:
+                pv = [chess.Move.from_uci(uci) for uci in state['pv']]
+            else:
+                pv = extract_pv(board, best_move, current_depth, aggression_factor, tactical_bonus)
+            search_info.update(depth=current_depth, score=best_score, pv=pv)
+            print(f"🧠 Depth {current_depth}: {best_move.uci()} = {best_score} ({len(connections)} hosts)")
+            if abs(best_score) >= MATE_THRESHOLD:
+                break
+    finally:
+        for _, sock, stream in connections:
+            try:
+                stream.close()
+                sock.close()
+            except OSError:
+                pass
     
+    return best_move, best_score, nodes_searched, completed_depth
+
+# Opening book - python-chess memory-maps the file and binary-searches it by Zobrist key
+book_state = {'reader': None, 'opened': False}
+book_stats = {'probes': 0, 'hits': 0}
+
+def get_book_reader():
+    """The book reader, opened on first use - None without a book"""
+    if not book_state['opened']:
+        book_state['opened'] = True
+        if OPENING_BOOK and os.path.exists(OPENING_BOOK):
+            try:
+                book_state['reader'] = chess.polyglot.open_reader(OPENING_BOOK)
+                print(f"📖 Opening book: {OPENING_BOOK} ({len(book_state['reader'])} entries)")
+            except Exception as e:
+                print(f"⚠️ Opening book {OPENING_BOOK} unusable: {e}")
+    return book_state['reader']
+
+def book_hit_rate():
+    return 100.0 * book_stats['hits'] / book_stats['probes'] if book_stats['probes'] else 0.0
+
+def probe_book(board):
+    """Book move picked at random by weight, or None out of book or past BOOK_MAX_PLY"""
+    if board.ply() >= BOOK_MAX_PLY:
+        return None
+    reader = get_book_reader()
+    if reader is None:
+        return None
+    
+    book_stats['probes'] += 1
+    entries = list(reader.find_all(board))
+    if not entries:
+        return None
+    book_stats['hits'] += 1
+    return random.choices(entries, weights=[entry.weight for entry in entries])[0].move
+
+# Syzygy tablebases - opened once per process, python-chess opens the table files lazily
+TB_WIN_SCORE = MATE_THRESHOLD - 1000  # Tablebase wins rank just below forced mates
+tablebase_state = {'tablebase': None, 'opened': False, 'pieces': 0}
+tablebase_stats = {'probes': 0, 'hits': 0}
+
+def get_tablebase():
+    """The tablebase, opened on first use - None without tables"""
+    if not tablebase_state['opened']:
+        tablebase_state['opened'] = True
+        directories = [directory for directory in SYZYGY_PATH.split(os.pathsep) if directory and os.path.isdir(directory)]
+        if directories:
+            tablebase = chess.syzygy.Tablebase()
+            for directory in directories:
+                tablebase.add_directory(directory)
+            # Largest table on disk, e.g. KRPvKR = 5 pieces
+            pieces = max((len(name) - 1 for name in tablebase.wdl), default=0)
+            if pieces:
+                tablebase_state.update(tablebase=tablebase, pieces=pieces)
+                print(f"📚 Syzygy tablebases: {len(tablebase.wdl)} WDL / {len(tablebase.dtz)} DTZ tables, up to {pieces} pieces")
+    return tablebase_state['tablebase']
+
+def in_tablebase_range(board):
+    """Few enough pieces for the tables on disk (and no castling, which Syzygy doesn't know)"""
+    return (get_tablebase() is not None and not board.castling_rights
+            and chess.popcount(board.occupied) <= tablebase_state['pieces'])
+
+def tablebase_score(board, wdl, depth):
+    """Search score for a WDL result - cursed wins and blessed losses are draws under the 50-move rule"""
+    if wdl == 2:
+        return TB_WIN_SCORE + depth  # Nearer wins score higher
+    if wdl == -2:
+        return -TB_WIN_SCORE - depth
+    return -5000 if board.turn == chess.BLACK else 5000  # evaluate_board's draw score, side to move view
+
+def probe_wdl(board):
+    """WDL of the side to move, or None when the table is missing"""
+    tablebase_stats['probes'] += 1
+    wdl = get_tablebase().get_wdl(board)
+    if wdl is not None:
+        tablebase_stats['hits'] += 1
+    return wdl
+
+def probe_root_tablebase(board):
+    """(move, wdl) - the DTZ-optimal move: fastest zeroing win, slowest loss - or None off the tables.
+    DTZ counts from the root: a capture or pawn move zeroes at once (DTZ +-1), anything else
+    adds its own ply. A win the 50-move counter runs out on first only counts as a cursed win"""
+    if not in_tablebase_range(board):
+        return None
+    
+    tablebase = get_tablebase()
+    best, best_key = None, None
+    for move in board.legal_moves:
+        zeroing = board.is_zeroing(move)
+        board.push(move)
+        try:
+            if board.is_checkmate():
+                return move, 2
+            tablebase_stats['probes'] += 1
+            wdl, dtz = tablebase.get_wdl(board), tablebase.get_dtz(board)
+        finally:
+            board.pop()
+        if wdl is None or dtz is None:
+            return None  # A table is missing - let the search handle it
+        tablebase_stats['hits'] += 1
+        
+        # Scores of the position after the move are the opponent's
+        wdl, dtz = -wdl, -dtz
+        sign = (wdl > 0) - (wdl < 0)
+        dtz = sign if zeroing else dtz + sign
+        if wdl and board.halfmove_clock + abs(dtz) > 100:
+            wdl = sign  # Cursed win / blessed loss - a draw under the 50-move rule
+        key = (wdl, -abs(dtz) if wdl > 0 else abs(dtz))
+        if best_key is None or key > best_key:
+            best, best_key = (move, wdl), key
+    return best
+
+def get_best_move(board, difficulty, game_clock=None):
+    """DESTROYER AI - Finds the most BRUTAL moves possible.
+    game_clock ({'remaining', 'increment', 'moves_to_go'}) replaces the fixed think_time"""
     settings = DIFFICULTY_SETTINGS[difficulty]
     depth = settings['depth']
     randomness = settings['randomness']
@@ -1112,6 +2860,25 @@ def get_best_move(board, difficulty):
     if not moves:
         return None, "No legal moves"
     
+    # Nothing to think about
+    if len(moves) == 1:
+        return moves[0], "⚔️ FORCED MOVE! ⚔️\n💀 NO ESCAPE FOR EITHER OF US! 💀"
+    
+    # Known theory costs nothing
+    book_move = probe_book(board)
+    if book_move:
+        print(f"📖 Book move: {book_move.uci()} | Book hits: {book_stats['hits']}/{book_stats['probes']} ({book_hit_rate():.0f}%)")
+        return book_move, "📖 STRAIGHT FROM THE BOOK! 📖\n😈 I KNOW THIS ONE BY HEART! 😈"
+    
+    # Solved endgame - the tablebase move is perfect
+    tablebase_move = probe_root_tablebase(board)
+    if tablebase_move:
+        move, wdl = tablebase_move
+        print(f"📚 Tablebase move: {move.uci()} (WDL {wdl:+d}) | TB hits: {tablebase_stats['hits']}/{tablebase_stats['probes']}")
+        if wdl > 0:
+            return move, "📚 TABLEBASE WIN! 📚\n💀 IT'S ALREADY SOLVED - YOU'RE FINISHED! 💀"
+        return move, "📚 TABLEBASE MOVE! 📚\n🛡️ PERFECT PLAY FROM HERE! 🛡️"
+    
     # Even "random" moves are aggressive
     if randomness > 0 and random.random() < randomness:
         aggressive_moves = []
@@ -1151,69 +2918,28 @@ def get_best_move(board, difficulty):
     best_move = None
     best_score = float('-inf')
     start_time = time.time()
+    soft_time, hard_time = allocate_time(max_think_time, game_clock)
+    start_search_clock(soft_time, hard_time)
+    search_info.update(depth=0, score=0, pv=[])
+    
+    # Incremental Zobrist keys for the whole search, tables carried over from the last move
+    board = to_search_board(board)
+    age_search_state()
     
     # Advanced move ordering
     ordered_moves = advanced_move_ordering(board, moves, aggression_factor, depth)
     
-    move_evaluations = []
-    nodes_searched = 0
-    
-    # Iterative deepening for better time management
-    for current_depth in range(1, depth + 1):
-        if time.time() - start_time > max_think_time * 0.8:
-            print(f"⏰ Time limit approaching, stopping at depth {current_depth-1}")
-            break
-        
-        current_best = None
-        current_best_score = float('-inf')
-        
-        for i, move in enumerate(ordered_moves):
-            if time.time() - start_time > max_think_time:
-                print(f"⏰ Time limit reached at depth {current_depth}, move {i+1}")
-                break
-                
-            try:
-                board.push(move)
-                
-                # Use full window search for first move, then null window for others
-                if i == 0:
-                    score = -minimax_with_pruning(board, current_depth - 1, float('-inf'), float('inf'), 
-                                               False, start_time, max_think_time, aggression_factor, tactical_bonus)
-                else:
-                    # Null window search
-                    score = -minimax_with_pruning(board, current_depth - 1, -current_best_score-1, -current_best_score, 
-                                               False, start_time, max_think_time, aggression_factor, tactical_bonus)
-                    
-                    # Re-search if null window failed
-                    if score > current_best_score:
-                        score = -minimax_with_pruning(board, current_depth - 1, float('-inf'), float('inf'), 
-                                                   False, start_time, max_think_time, aggression_factor, tactical_bonus)
-                
-                board.pop()
-                nodes_searched += 1
-                
-                if i < 5 and current_depth == depth:  # Debug top moves at final depth
-                    move_type = "CAPTURE" if board.is_capture(move) else "MOVE"
-                    print(f"  💀 {move_type} {i+1}: {move.uci()} = {score}")
-                
-                if score > current_best_score:
-                    current_best_score = score
-                    current_best = move
-                    
-            except Exception as e:
-                print(f"Error evaluating {move.uci()}: {e}")
-                try:
-                    board.pop()
-                except:
-                    pass
-                continue
-        
-        if current_best:
-            best_move = current_best
-            best_score = current_best_score
-            
-            if current_depth >= 3:  # Start showing intermediate results
-                print(f"🧠 Depth {current_depth}: {best_move.uci()} = {best_score}")
+    # Iterative deepening (spread over remote hosts or helper processes on the top levels)
+    workers = settings.get('workers', 1)
+    if ANALYSIS_HOSTS:
+        best_move, best_score, nodes_searched, _ = distributed_root_search(
+            board, ordered_moves, depth, aggression_factor, tactical_bonus, ANALYSIS_HOSTS)
+    elif workers > 1:
+        best_move, best_score, nodes_searched, _ = lazy_smp_search(
+            board, depth, aggression_factor, tactical_bonus, workers)
+    else:
+        best_move, best_score, nodes_searched, _ = iterative_deepening(
+            board, ordered_moves, depth, aggression_factor, tactical_bonus)
     
     if not best_move:
         # Emergency fallback - pick most aggressive move
@@ -1249,7 +2975,9 @@ def get_best_move(board, difficulty):
     nps = nodes_searched / max(think_time, 0.001)  # Nodes per second
     
     print(f"🎯 DESTROYER CHOICE: {best_move.uci()} (score: {best_score})")
-    print(f"⏱️ Time: {think_time:.1f}s | Nodes: {nodes_searched} | NPS: {nps:.0f}")
+    if search_info['pv']:
+        print(f"🔮 Principal variation: {' '.join(move.uci() for move in search_info['pv'])}")
+    print(f"⏱️ Time: {think_time:.1f}s | Nodes: {nodes_searched} | NPS: {nps:.0f} | Eval cache hits: {eval_cache_hit_rate():.1f}% | Pawn hash hits: {pawn_hash_hit_rate():.1f}% | Lazy eval exits: {lazy_eval_report()} | TB hits: {tablebase_stats['hits']}/{tablebase_stats['probes']}")
     
     # Show alternative moves
     if len(ordered_moves) > 1:
@@ -1276,11 +3004,9 @@ def get_captured_pieces(board):
         'black': {'p': 0, 'r': 0, 'n': 0, 'b': 0, 'q': 0, 'k': 0}
     }
     
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            color = 'white' if piece.color == chess.WHITE else 'black'
-            piece_count[color][piece.symbol().lower()] += 1
+    for color_name, color in (('white', chess.WHITE), ('black', chess.BLACK)):
+        for piece_type in chess.PIECE_TYPES:
+            piece_count[color_name][chess.piece_symbol(piece_type)] = chess.popcount(board.pieces_mask(piece_type, color))
     
     starting_counts = {'p': 8, 'r': 2, 'n': 2, 'b': 2, 'q': 1, 'k': 1}
     piece_symbols = {'p': '♟', 'r': '♜', 'n': '♞', 'b': '♝', 'q': '♛', 'k': '♚'}
@@ -1370,6 +3096,89 @@ def ai_think_thread(board, difficulty):
     finally:
         ai_move_result['thinking'] = False
 
+def get_ponder_move(board, difficulty):
+    """Predicted human reply - second move of the last principal variation,
+    else the hash move the last search left for this position"""
+    pv = search_info['pv']
+    if len(pv) >= 2 and board.move_stack and board.peek() == pv[0] and pv[1] in board.legal_moves:
+        return pv[1]
+    
+    settings = DIFFICULTY_SETTINGS[difficulty]
+    tt_entry = tt_probe(position_key(board) ^ eval_salt(settings['aggression'], settings['tactical_bonus']))
+    if tt_entry and tt_entry[3] in board.legal_moves:
+        return tt_entry[3]
+    return None
+
+def ai_ponder_thread(board, difficulty, predicted_move):
+    """Search the position after the predicted human move until hit or miss"""
+    try:
+        ponder_board = board.copy()
+        ponder_board.push(predicted_move)
+        result = get_best_move(ponder_board, difficulty)
+    except Exception as e:
+        print(f"🔥 Ponder error: {e}")
+        result = None
+    
+    with ponder_state['lock']:
+        ponder_state['active'] = False
+        ponder_state['result'] = result
+        if ponder_state['hit']:
+            publish_ponder_result(result)
+
+def publish_ponder_result(result):
+    """Hand a ponder hit's search result to the regular AI move slot"""
+    if result:
+        ai_move_result['move'], ai_move_result['strategy'] = result
+    else:
+        ai_move_result['move'], ai_move_result['strategy'] = None, "PONDER FAILED!"
+    ai_move_result['thinking'] = False
+
+def start_pondering(board, difficulty):
+    """Kick off a background search of the expected human reply"""
+    stop_pondering()
+    if not PONDER_ENABLED or board.is_game_over():
+        return
+    predicted_move = get_ponder_move(board, difficulty)
+    if not predicted_move:
+        return
+    
+    ponder_state['stop'].clear()
+    ponder_state.update(move=predicted_move, hit_time=None, hit=False, result=None, active=True)
+    thread = threading.Thread(target=ai_ponder_thread, args=(board.copy(), difficulty, predicted_move))
+    thread.daemon = True
+    ponder_state['thread'] = thread
+    print(f"🧠 Pondering on your expected reply {predicted_move.uci()}...")
+    thread.start()
+
+def stop_pondering():
+    """Ponder miss (or reset) - throw the background search away"""
+    thread = ponder_state['thread']
+    if thread is None:
+        return
+    ponder_state['stop'].set()
+    # Every node checks the stop flag, so this returns promptly - and no new search may
+    # touch the shared tables or search_info while the old one is still running
+    thread.join()
+    ponder_state.update(thread=None, move=None, hit=False, result=None)
+
+def ponder_hit(human_move):
+    """Keep the ponder search if the human played the predicted move.
+    Returns True when the AI move will come from the ponder search"""
+    if ponder_state['thread'] is None or human_move != ponder_state['move']:
+        stop_pondering()
+        return False
+    
+    print(f"🎯 PONDER HIT on {human_move.uci()}! Search already underway!")
+    with ponder_state['lock']:
+        ponder_state['hit'] = True
+        ponder_state['hit_time'] = time.time()  # The search's own soft/hard limits run from here
+        if ponder_state['active']:
+            ai_move_result['thinking'] = True
+        else:
+            publish_ponder_result(ponder_state['result'])
+    ponder_state['move'] = None  # One hit per prediction
+    return True
+
 def main():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -1383,7 +3192,7 @@ def main():
         return
     
     clock = pygame.time.Clock()
-    global transposition_table, ai_move_result, killer_moves, history_table
+    global ai_move_result, PONDER_ENABLED
 
     # Game state
     board = chess.Board()
@@ -1410,7 +3219,7 @@ def main():
     print("🎯 Features: 9-depth search, quiescence, iterative deepening, killer moves!")
     print("🔥 WARNING: Even 'Easy' mode will CRUSH most players!")
     print("💀 GOAT MODE: Prepare to witness chess perfection!")
-    print("📋 Controls: Mouse=Move, R=Restart, U=Undo, 1-5=Difficulty, Q=Quit")
+    print("📋 Controls: Mouse=Move, R=Restart, U=Undo, P=Ponder, 1-5=Difficulty, Q=Quit")
 
     while running:
         try:
@@ -1423,11 +3232,10 @@ def main():
                 elif event.type == pygame.KEYDOWN:
                     new_difficulty = handle_difficulty_change(event.key)
                     if new_difficulty:
+                        stop_pondering()
                         difficulty = new_difficulty
                         ai_depth = DIFFICULTY_SETTINGS[difficulty]['depth']
-                        transposition_table.clear()
-                        killer_moves.clear()
-                        history_table.clear()
+                        age_search_state()
                         
                         aggression = DIFFICULTY_SETTINGS[difficulty]['aggression']
                         tactical = DIFFICULTY_SETTINGS[difficulty]['tactical_bonus']
@@ -1454,6 +3262,7 @@ def main():
                     
                     if event.key == pygame.K_r:
                         print("Restarting... DESTROYER AI hungry for new victim!")
+                        stop_pondering()
                         board.reset()
                         move_history = [board.copy()]
                         selected_square = None
@@ -1462,9 +3271,9 @@ def main():
                         current_eval = 0.0
                         threatened_squares = []
                         danger_levels = {}
-                        transposition_table.clear()
-                        killer_moves.clear()
-                        history_table.clear()
+                        tt_clear()
+                        age_search_state()
+                        clear_move_heuristics()
                         ai_move_result = {'move': None, 'strategy': None, 'thinking': False}
                         if ai_thread and ai_thread.is_alive():
                             ai_thread.join(timeout=1.0)
@@ -1479,8 +3288,15 @@ def main():
                         running = False
                         break
                         
+                    elif event.key == pygame.K_p:
+                        PONDER_ENABLED = not PONDER_ENABLED
+                        if not PONDER_ENABLED:
+                            stop_pondering()
+                        print(f"🧠 Pondering {'ON - AI thinks on YOUR time!' if PONDER_ENABLED else 'OFF'}")
+                        
                     elif event.key == pygame.K_u:
                         if not ai_move_result['thinking']:
+                            stop_pondering()
                             if len(move_history) >= 3:
                                 move_history = move_history[:-2]
                                 board = move_history[-1].copy()
@@ -1538,7 +3354,7 @@ def main():
                                     
                                     try:
                                         settings = DIFFICULTY_SETTINGS[difficulty]
-                                        current_eval = evaluate_board(board, settings['aggression'], settings['tactical_bonus']) / 100.0
+                                        current_eval = compute_evaluation(board, settings['aggression'], settings['tactical_bonus']) / 100.0
                                     except:
                                         current_eval = 0.0
                                     
@@ -1615,7 +3431,7 @@ def main():
                         # Position analysis for human
                         try:
                             settings = DIFFICULTY_SETTINGS[difficulty]
-                            eval_score = evaluate_board(board, settings['aggression'], settings['tactical_bonus'])
+                            eval_score = compute_evaluation(board, settings['aggression'], settings['tactical_bonus'])
                             if eval_score > 500:
                                 ai_strategy = "YOU'RE FINISHED! \nTOTAL DOMINATION!"
                             elif eval_score > 200:
@@ -1641,19 +3457,23 @@ def main():
             # Handle AI moves with ULTRA AGGRESSIVE commentary
             if board.turn == chess.BLACK and not board.is_game_over():
                 if not ai_move_result['thinking'] and ai_move_result['move'] is None:
-                    # Start AI thinking in background
-                    settings = DIFFICULTY_SETTINGS[difficulty]
-                    aggression = settings['aggression']
-                    tactical = settings['tactical_bonus']
-                    
-                    print(f"CHESS AI ACTIVATED! Level: {difficulty} ")
-                    print(f"Aggression: {aggression}x | Tactical: {tactical}x | Depth: {ai_depth}")
-                    print("CALCULATING YOUR ANNIHILATION...")
-                    
-                    ai_thread = threading.Thread(target=ai_think_thread, args=(board, difficulty))
-                    ai_thread.daemon = True
-                    ai_thread.start()
-                    ai_thinking_start = time.time()
+                    # Ponder hit - the search on the predicted move carries on
+                    if board.move_stack and ponder_hit(board.peek()):
+                        ai_thinking_start = time.time()
+                    else:
+                        # Start AI thinking in background
+                        settings = DIFFICULTY_SETTINGS[difficulty]
+                        aggression = settings['aggression']
+                        tactical = settings['tactical_bonus']
+                        
+                        print(f"CHESS AI ACTIVATED! Level: {difficulty} ")
+                        print(f"Aggression: {aggression}x | Tactical: {tactical}x | Depth: {ai_depth}")
+                        print("CALCULATING YOUR ANNIHILATION...")
+                        
+                        ai_thread = threading.Thread(target=ai_think_thread, args=(board, difficulty))
+                        ai_thread.daemon = True
+                        ai_thread.start()
+                        ai_thinking_start = time.time()
                 
                 elif not ai_move_result['thinking'] and ai_move_result['move'] is not None:
                     # AI has finished thinking - TIME FOR DESTRUCTION
@@ -1692,10 +3512,13 @@ def main():
                         # Update evaluation
                         try:
                             settings = DIFFICULTY_SETTINGS[difficulty]
-                            current_eval = evaluate_board(board, settings['aggression'], settings['tactical_bonus']) / 100.0
+                            current_eval = compute_evaluation(board, settings['aggression'], settings['tactical_bonus']) / 100.0
                         except:
                             current_eval = 0.0
                         
+                        # Think on the human's time
+                        start_pondering(board, difficulty)
+                        
                         # Enhanced post-move analysis
                         if board.is_check():
                             print("CHECK DELIVERED! Your king trembles in fear!")
@@ -1780,8 +3603,10 @@ def main():
             continue
 
     # Cleanup
+    stop_pondering()
     if ai_thread and ai_thread.is_alive():
         ai_thread.join(timeout=2.0)
+    shutdown_smp_pool()
     
     pygame.quit()
     print(" Thanks for playing CHESS AI!")
@@ -1790,6 +3615,9 @@ def main():
     print("Remember: Even losing to this AI is an honor!")
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--worker':
+        analysis_worker(sys.argv[2])
+        sys.exit(0)
     try:
         main()
     except Exception as e:
@@ -0,0 +1,35 @@
+"""Bitboard evaluation terms against the square-scan reference versions kept in bench.py"""
+import random
+
+import pytest
+
+import bench
+import main
+
+TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope="module")
+def positions():
+    """Seeded random-game sweep - copies, since the generator keeps moving one board"""
+    return [(board.copy(stack=False), aggression)
+            for board, aggression in bench.random_positions(40, random.Random(1))]
+
+
+@pytest.mark.parametrize("fast, reference, uses_map", [
+    (main.evaluate_tactical_motifs, bench.reference_tactical_motifs, True),
+    (main.evaluate_pawn_structure, bench.reference_pawn_structure, False),
+    (main.evaluate_piece_activity, bench.reference_piece_activity, True),
+], ids=["tactical motifs", "pawn structure", "piece activity"])
+def test_term_matches_square_scan(positions, fast, reference, uses_map):
+    for board, aggression in positions:
+        expected = reference(board, aggression)
+        assert abs(fast(board, aggression) - expected) <= TOLERANCE, board.fen()
+        if uses_map:
+            shared = fast(board, aggression, main.AttackMap(board))
+            assert abs(shared - expected) <= TOLERANCE, board.fen()
+
+
+def test_captured_pieces_match_square_scan(positions):
+    for board, _ in positions:
+        assert main.get_captured_pieces(board) == bench.reference_captured_pieces(board), board.fen()
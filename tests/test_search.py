@@ -0,0 +1,153 @@
+"""Search correctness - the PVS search against a plain alpha-beta reference on the same leaves.
+Selective pruning, null move, late move reductions and lazy evaluation are switched off (they are
+lossy by design) unless a test turns one back on; the table, move ordering, null windows, re-searches and
+aspiration windows all stay on"""
+import itertools
+
+import chess
+import pytest
+
+import main
+
+SETTINGS = main.DIFFICULTY_SETTINGS['Goat']
+ARGS = (SETTINGS['aggression'], SETTINGS['tactical_bonus'])
+INF = float('inf')
+
+# Mates, won and drawn endings, both sides to move
+SMALL_POSITIONS = [
+    "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    "3r2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1",
+    "8/8/8/3k4/8/2Q5/8/3K4 w - - 0 1",
+    "8/2k5/8/8/3b4/8/4PP2/4K3 b - - 0 1",
+    "4k3/8/4K3/8/8/8/8/7R w - - 0 1",
+]
+
+PVS_POSITIONS = SMALL_POSITIONS + [
+    "r5k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1",
+    "8/5k2/8/3n4/8/2N5/5K2/8 b - - 0 1",
+    "8/5pk1/6p1/3R4/7P/6P1/r4PK1/8 b - - 0 40",
+]
+
+MATE_POSITIONS = [
+    "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    "3r2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1",
+    "4k3/8/4K3/8/8/8/8/7R w - - 0 1",
+    "r5k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1",
+]
+
+
+def alpha_beta(board, depth, alpha, beta):
+    """Reference fail-soft alpha-beta - every legal move, no table, no reductions"""
+    if depth <= 0:
+        return main.quiescence_search(board, alpha, beta, main.QSEARCH_DEPTH, *ARGS)
+    if board.is_game_over():
+        if board.is_checkmate():
+            return -main.MATE_SCORE - depth
+        return main.static_eval(board, *ARGS)
+
+    best = -INF
+    for move in sorted(board.legal_moves, key=board.is_capture, reverse=True):
+        board.push(move)
+        score = -alpha_beta(board, depth - 1, -beta, -max(alpha, best))
+        board.pop()
+        best = max(best, score)
+        if best >= beta:
+            break
+    return best
+
+
+def fresh_tables():
+    main.tt_clear()
+    main.clear_move_heuristics()
+    main.eval_cache_clear()
+    main.pawn_hash_clear()
+    main.start_search_clock(INF, INF)
+
+
+def reference_score(fen, depth):
+    fresh_tables()
+    return alpha_beta(main.SearchBoard(fen), depth, -INF, INF)
+
+
+@pytest.fixture
+def exact_search(monkeypatch):
+    """Only the score-preserving parts of the search"""
+    for flag in ('FUTILITY_PRUNING', 'REVERSE_FUTILITY_PRUNING', 'RAZORING', 'LATE_MOVE_PRUNING',
+                 'SEE_QSEARCH_PRUNING', 'DELTA_PRUNING', 'NULL_MOVE_PRUNING', 'LATE_MOVE_REDUCTIONS',
+                 'LAZY_EVAL'):
+        monkeypatch.setattr(main, flag, False)
+
+
+@pytest.fixture
+def re_searches(monkeypatch):
+    """Counts the re-searches of a child by the same parent node:
+    'lmr' when it comes back deeper, 'pvs' when it comes back on a wider window"""
+    search = main.minimax_with_pruning
+    counts = {'lmr': 0, 'pvs': 0}
+    calls = itertools.count()
+    parents = []
+    last_window = {}
+
+    def counting_search(board, depth, alpha, beta, *args, **kwargs):
+        child = (parents[-1] if parents else None, main.position_key(board))
+        if child in last_window:
+            last_depth, last_alpha, last_beta = last_window[child]
+            if depth > last_depth:
+                counts['lmr'] += 1
+            elif beta - alpha > last_beta - last_alpha:
+                counts['pvs'] += 1
+        last_window[child] = (depth, alpha, beta)
+        parents.append(next(calls))
+        try:
+            return search(board, depth, alpha, beta, *args, **kwargs)
+        finally:
+            parents.pop()
+
+    monkeypatch.setattr(main, 'minimax_with_pruning', counting_search)
+    return counts
+
+
+@pytest.mark.parametrize("fen", PVS_POSITIONS)
+def test_pvs_matches_alpha_beta(fen, exact_search, re_searches):
+    expected = reference_score(fen, 4)
+    fresh_tables()
+    score = main.minimax_with_pruning(main.SearchBoard(fen), 4, -INF, INF, *ARGS)
+    assert score == expected
+    if fen != MATE_POSITIONS[-1]:  # Mate in one - the first move settles it
+        assert re_searches['pvs'] > 0
+
+
+@pytest.mark.parametrize("fen", SMALL_POSITIONS)
+def test_late_move_reductions_match_alpha_beta(fen, exact_search, re_searches, monkeypatch):
+    # Reduced moves that fail high must come back at full depth and land on the same score
+    monkeypatch.setattr(main, 'LATE_MOVE_REDUCTIONS', True)
+    expected = reference_score(fen, 5)
+    fresh_tables()
+    score = main.minimax_with_pruning(main.SearchBoard(fen), 5, -INF, INF, *ARGS)
+    assert score == expected
+    assert re_searches['lmr'] > 0
+    assert re_searches['pvs'] > 0
+
+
+@pytest.mark.parametrize("fen", [fen for fen in PVS_POSITIONS if fen not in MATE_POSITIONS])
+def test_iterative_deepening_matches_alpha_beta(fen, exact_search):
+    # Aspiration windows from depth 3 on, root re-sorted every iteration (a mate ends it early)
+    expected = reference_score(fen, 4)
+    fresh_tables()
+    board = main.SearchBoard(fen)
+    moves = main.advanced_move_ordering(board, list(board.legal_moves), ARGS[0], 4)
+    move, score, _, completed_depth = main.iterative_deepening(board, moves, 4, *ARGS, verbose=False)
+    assert completed_depth == 4
+    assert score == expected
+    board.push(move)
+    assert -reference_score(board.fen(), 3) == expected
+
+
+def test_late_move_pruning_spares_evasions_and_mate_windows():
+    # Check from the rook: every king move is an evasion, however late in the list
+    board = main.SearchBoard("4r1k1/8/8/8/8/8/3PPP2/4K3 w - - 0 1")
+    evasion = chess.Move.from_uci("e1d1")
+    assert not main.prune_late_move(board, evasion, 30, 1, False, selective=False)
+    quiet = main.SearchBoard("6k1/8/8/8/8/8/3PPP2/4K3 w - - 0 1")
+    assert main.prune_late_move(quiet, evasion, 30, 1, False, selective=True)
+    assert not main.prune_late_move(quiet, evasion, 30, 1, False, selective=False)
@@ -0,0 +1,54 @@
+"""Root tablebase move choice - DTZ ranking and the 50-move rule, on a stub table"""
+import chess
+import pytest
+
+import main
+
+
+class StubTablebase:
+    """Every position is won for the side that has the extra material (White here).
+    Zeroing moves restart the DTZ count: a new phase starts long after a quiet move would"""
+
+    def __init__(self, quiet_dtz, zeroed_dtz):
+        self.quiet_dtz = quiet_dtz
+        self.zeroed_dtz = zeroed_dtz
+
+    def get_wdl(self, board):
+        return 2 if board.turn == chess.WHITE else -2
+
+    def get_dtz(self, board):
+        dtz = self.zeroed_dtz if board.halfmove_clock == 0 else self.quiet_dtz
+        return dtz if board.turn == chess.WHITE else -dtz
+
+
+@pytest.fixture
+def stub_tablebase(monkeypatch):
+    def install(quiet_dtz, zeroed_dtz):
+        monkeypatch.setattr(main, 'tablebase_state',
+                            {'tablebase': StubTablebase(quiet_dtz, zeroed_dtz), 'opened': True, 'pieces': 5})
+    return install
+
+
+def test_kpk_promotes_instead_of_shuffling(stub_tablebase):
+    # After the promotion the KQK table starts counting again - still the fastest conversion
+    stub_tablebase(quiet_dtz=5, zeroed_dtz=20)
+    board = chess.Board("8/4P3/8/8/8/k7/8/4K3 w - - 0 1")
+    move, wdl = main.probe_root_tablebase(board)
+    assert wdl == 2
+    assert move.promotion
+
+
+def test_kqk_capture_is_a_zeroing_win(stub_tablebase):
+    stub_tablebase(quiet_dtz=9, zeroed_dtz=30)
+    board = chess.Board("8/8/8/3k4/8/2Q5/3p4/3K4 w - - 0 1")
+    move, wdl = main.probe_root_tablebase(board)
+    assert wdl == 2
+    assert board.is_capture(move)
+
+
+def test_win_past_the_fifty_move_counter_is_cursed(stub_tablebase):
+    # 95 reversible plies played: a quiet move reaching the zeroing move 8 plies later is a draw
+    stub_tablebase(quiet_dtz=8, zeroed_dtz=8)
+    board = chess.Board("8/8/8/3k4/8/2Q5/8/3K4 w - - 95 80")
+    move, wdl = main.probe_root_tablebase(board)
+    assert wdl == 1
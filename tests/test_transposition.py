@@ -0,0 +1,43 @@
+"""Transposition table replacement and clearing"""
+import chess
+import pytest
+
+import main
+
+KEY = 0x9D39247E33776D41
+
+
+@pytest.fixture(autouse=True)
+def empty_table():
+    main.tt_clear()
+    yield
+    main.tt_clear()
+
+
+def test_same_key_keeps_deeper_entry():
+    main.tt_store(KEY, 6, 120, main.TT_LOWERBOUND, chess.Move.from_uci("e2e4"))
+    main.tt_store(KEY, 2, -40, main.TT_UPPERBOUND, chess.Move.from_uci("d2d4"))
+    assert main.tt_probe(KEY) == (6, 120, main.TT_LOWERBOUND, chess.Move.from_uci("e2e4"))
+
+
+def test_same_key_exact_replaces_deeper_entry():
+    main.tt_store(KEY, 6, 120, main.TT_LOWERBOUND)
+    main.tt_store(KEY, 2, 35, main.TT_EXACT, chess.Move.from_uci("d2d4"))
+    assert main.tt_probe(KEY) == (2, 35, main.TT_EXACT, chess.Move.from_uci("d2d4"))
+
+
+def test_same_key_replaces_deeper_entry_from_older_search():
+    main.tt_store(KEY, 6, 120, main.TT_LOWERBOUND, chess.Move.from_uci("e2e4"))
+    main.tt_new_search()
+    main.tt_store(KEY, 2, -40, main.TT_UPPERBOUND)
+    assert main.tt_probe(KEY) == (2, -40, main.TT_UPPERBOUND, chess.Move.from_uci("e2e4"))
+
+
+def test_clear_wipes_shared_table_in_place():
+    shared = main.tt_shared
+    main.tt_new_search()
+    main.tt_store(KEY, 4, 10, main.TT_EXACT)
+    main.tt_clear()
+    assert main.tt_shared is shared  # SMP workers stay attached to the same memory
+    assert main.tt_probe(KEY) is None
+    assert main.tt_generation == 0